@@ -0,0 +1,36 @@
+"""Add sync_checkpoints table for incremental PowerBI syncs
+
+Revision ID: 3e8d1a6b9f20
+Revises: 7b2e4f9a1c3d
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3e8d1a6b9f20'
+down_revision: Union[str, None] = '7b2e4f9a1c3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    op.create_table('sync_checkpoints',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('table_name', sa.String(), nullable=False),
+        sa.Column('region', sa.String(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('row_hash', sa.String(), nullable=False),
+        sa.Column('last_synced_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(
+        'CREATE UNIQUE INDEX IF NOT EXISTS ix_sync_checkpoints_key '
+        'ON sync_checkpoints (table_name, bucket_start, region)'
+    )
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS ix_sync_checkpoints_key')
+    op.drop_table('sync_checkpoints')
@@ -0,0 +1,48 @@
+"""Add composite region/timestamp and BRIN timestamp indexes
+
+Revision ID: 7b2e4f9a1c3d
+Revises: c41d1ce08c30
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2e4f9a1c3d'
+down_revision: Union[str, None] = 'c41d1ce08c30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, composite index, BRIN index, single-column timestamp index it replaces)
+INDEXES = [
+    ('energy_consumption', 'ix_ec_region_ts', 'ix_ec_ts_brin', 'ix_energy_consumption_timestamp'),
+    ('anomalies', 'ix_anom_region_ts', 'ix_anom_ts_brin', 'ix_anomalies_timestamp'),
+]
+
+def _columns(table: str) -> set:
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+def upgrade() -> None:
+    for table, composite, brin, single in INDEXES:
+        columns = _columns(table)
+        
+        # Tables created before region/timestamp were added have nothing to index
+        if not {'region', 'timestamp'} <= columns:
+            continue
+        
+        op.execute(f'CREATE INDEX IF NOT EXISTS {composite} ON {table} (region, timestamp)')
+        op.execute(f'CREATE INDEX IF NOT EXISTS {brin} ON {table} USING brin (timestamp)')
+        
+        # The BRIN index covers timestamp range scans on its own
+        op.execute(f'DROP INDEX IF EXISTS {single}')
+
+def downgrade() -> None:
+    for table, composite, brin, single in reversed(INDEXES):
+        if 'timestamp' in _columns(table):
+            op.execute(f'CREATE INDEX IF NOT EXISTS {single} ON {table} (timestamp)')
+        
+        op.execute(f'DROP INDEX IF EXISTS {brin}')
+        op.execute(f'DROP INDEX IF EXISTS {composite}')
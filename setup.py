@@ -8,12 +8,14 @@ setup(
     install_requires=[
         "fastapi>=0.68.0",
         "uvicorn>=0.15.0",
+        "orjson>=3.6.0",
         "python-dotenv>=0.19.0",
         "sqlalchemy>=1.4.23",
         "psycopg2-binary>=2.9.1",
         "alembic>=1.7.3",
         "pandas>=1.3.5,<2.0.0",
         "numpy>=1.21.2,<2.0.0",
+        "numba>=0.56.0",
         "python-jose[cryptography]>=3.3.0",
         "passlib[bcrypt]>=1.7.4",
         "python-multipart>=0.0.5",
@@ -29,7 +29,7 @@ class ForecastRequest(BaseModel):
     end_date: datetime
     n_periods: int = Field(24, ge=1, le=720)  # Max 30 days at hourly frequency
     region: Optional[str] = None
-    model_type: str = Field("prophet", regex="^(prophet|exponential_smoothing|arima)$")
+    model_type: str = Field("prophet", regex="^(prophet|exponential_smoothing|arima|ets_fast)$")
     model_params: Optional[Dict[str, Any]] = Field(default_factory=dict)
     fit_params: Optional[Dict[str, Any]] = Field(default_factory=dict)
 
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
@@ -58,7 +59,9 @@ def get_powerbi_service(db: Session = Depends(get_db_session)) -> PowerBIService
         client_id=settings.POWERBI_CLIENT_ID,
         client_secret=settings.POWERBI_CLIENT_SECRET,
         username=getattr(settings, 'POWERBI_USERNAME', None),
-        password=getattr(settings, 'POWERBI_PASSWORD', None)
+        password=getattr(settings, 'POWERBI_PASSWORD', None),
+        token_cache_path=getattr(settings, 'POWERBI_TOKEN_CACHE_PATH', None),
+        metadata_cache_path=getattr(settings, 'POWERBI_METADATA_CACHE_PATH', None)
     )
     
     return PowerBIService(config, db)
@@ -199,6 +202,10 @@ async def sync_energy_data(
 ):
     """
     Sync energy consumption data to PowerBI
+    
+    Only hourly buckets changed since their last push are sent. PowerBI push
+    tables are append-only, so a changed bucket's earlier rows stay alongside
+    the new ones unless clear_existing is set.
     """
     try:
         success = powerbi_service.sync_energy_consumption_data(
@@ -232,6 +239,10 @@ async def sync_anomaly_data(
 ):
     """
     Sync anomaly data to PowerBI
+    
+    Only hourly buckets changed since their last push are sent. PowerBI push
+    tables are append-only, so a changed bucket's earlier rows stay alongside
+    the new ones unless clear_existing is set.
     """
     try:
         success = powerbi_service.sync_anomaly_data(
@@ -360,11 +371,11 @@ async def export_report(
                 detail=f"Report '{request.report_name}' not found"
             )
             
-        # Export the report
-        file_content = powerbi_service.client.export_report(
+        # Export the report; the export polls PowerBI, so keep it off the event loop
+        file_content = await run_in_threadpool(
+            powerbi_service.client.export_report_to_file,
             report_id=report["id"],
-            file_format=request.file_format,
-            report_name=request.report_name
+            file_format=request.file_format
         )
         
         if file_content:
@@ -65,6 +65,7 @@ class Settings(BaseSettings):
     ML_MODEL_PATH: str = "./models"
     ML_ANOMALY_THRESHOLD: float = 2.0
     ML_CONTAMINATION_RATE: float = 0.1
+    ML_WARMUP_ON_STARTUP: bool = False  # Fit each model once at startup to avoid cold-start latency
     
     # External APIs
     KAGGLE_USERNAME: Optional[str] = None
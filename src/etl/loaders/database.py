@@ -25,6 +25,7 @@ class DatabaseLoader:
         """
         self.db = db_session
         self.batch_size = batch_size
+        self.stats: Dict[str, Any] = {}
     
     def load(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Load transformed data into the database.
@@ -45,6 +46,7 @@ class DatabaseLoader:
             'records_loaded': 0,
             'errors': []
         }
+        self.stats = stats
         
         try:
             # Process data in batches
@@ -77,14 +79,22 @@ class DatabaseLoader:
         return stats
     
     def _process_batch(self, batch: List[Dict[str, Any]], stats: Dict[str, Any]) -> None:
-        """Process a batch of records."""
+        """Process a batch of records with one executemany insert per table."""
         try:
-            for record in batch:
-                self._process_record(record, stats)
+            energy_rows = [self._energy_mapping(record, stats) for record in batch]
+            anomaly_rows = [self._anomaly_mapping(record) for record in batch if record.get('is_anomaly')]
+            
+            # Bulk inserts skip the per-object unit of work and identity map
+            self.db.bulk_insert_mappings(EnergyConsumption, energy_rows)
+            if anomaly_rows:
+                self.db.bulk_insert_mappings(Anomaly, anomaly_rows)
                 
             # Commit after each successful batch
             self.db.commit()
             
+            stats['records_processed'] += len(batch)
+            stats['records_loaded'] += len(energy_rows)
+            
         except Exception as e:
             self.db.rollback()
             stats['errors'].append({
@@ -94,44 +104,16 @@ class DatabaseLoader:
             logger.error(f"Error processing batch: {str(e)}")
             raise
     
-    def _process_record(self, record: Dict[str, Any], stats: Dict[str, Any]) -> None:
-        """Process a single record."""
+    def _energy_mapping(self, record: Dict[str, Any], stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the energy consumption row for a single record."""
         try:
-            # Create or update energy consumption record
-            energy_record = EnergyConsumption(
-                timestamp=record['timestamp'],
-                consumption_mwh=record['consumption_mwh'],
-                region=record['region'],
-                temperature=record.get('temperature'),
-                is_holiday=record.get('is_holiday', False),
-                hour_of_day=record.get('hour_of_day'),
-                day_of_week=record.get('day_of_week'),
-                is_weekend=record.get('is_weekend'),
-                month=record.get('month'),
-                year=record.get('year'),
-                season=record.get('season'),
-                data_quality_score=record.get('data_quality_score', 1.0)
-            )
-            
-            self.db.add(energy_record)
-            self.db.flush()  # Flush to get the ID for the anomaly record if needed
-            
-            # If this record was marked as an anomaly, create an anomaly record
-            if record.get('is_anomaly'):
-                anomaly = Anomaly(
-                    energy_consumption_id=energy_record.id,
-                    timestamp=record['timestamp'],
-                    region=record['region'],
-                    original_value=record['consumption_mwh'],
-                    predicted_value=record.get('predicted_value'),
-                    anomaly_score=record.get('anomaly_score', 0.0),
-                    method=record.get('anomaly_method', 'unknown'),
-                    metadata=record.get('anomaly_metadata', {})
-                )
-                self.db.add(anomaly)
-            
-            stats['records_processed'] += 1
-            stats['records_loaded'] += 1
+            return {
+                'timestamp': record['timestamp'],
+                'consumption_mwh': record['consumption_mwh'],
+                'region': record['region'],
+                'temperature': record.get('temperature'),
+                'is_holiday': bool(record.get('is_holiday', False))
+            }
             
         except Exception as e:
             stats['errors'].append({
@@ -141,6 +123,21 @@ class DatabaseLoader:
             logger.warning(f"Error processing record: {str(e)}")
             raise
     
+    @staticmethod
+    def _anomaly_mapping(record: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the anomaly row for a record marked as an anomaly."""
+        return {
+            'timestamp': record['timestamp'],
+            'region': record['region'],
+            'actual_value': record['consumption_mwh'],
+            'predicted_value': record.get('predicted_value'),
+            'anomaly_score': record.get('anomaly_score', 0.0)
+        }
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics about the last load."""
+        return dict(self.stats)
+    
     @staticmethod
     def _format_duration(start: datetime, end: datetime) -> str:
         """Format duration between two datetimes as a human-readable string."""
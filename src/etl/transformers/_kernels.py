@@ -0,0 +1,45 @@
+"""Numba kernels for the ETL transformers."""
+import numpy as np
+from numba import njit, prange
+
+# Nanoseconds per hour and per day
+_NS_PER_HOUR = 3_600_000_000_000
+_NS_PER_DAY = 24 * _NS_PER_HOUR
+
+@njit(cache=True, parallel=True)
+def calendar_fields(ts_ns: np.ndarray):
+    """
+    Hour, weekday, month and year of naive timestamps in one pass.
+    
+    Equivalent to the DatetimeIndex hour/dayofweek/month/year accessors, but
+    derives all four from each value at once. The date part uses the
+    days-to-civil conversion of the proleptic Gregorian calendar.
+    
+    Args:
+        ts_ns: int64 nanoseconds since the epoch (DatetimeIndex.asi8)
+    
+    Returns:
+        Tuple of (hour, day_of_week, month, year) int64 arrays; Monday is 0
+    """
+    n = ts_ns.shape[0]
+    hour = np.empty(n, dtype=np.int64)
+    day_of_week = np.empty(n, dtype=np.int64)
+    month = np.empty(n, dtype=np.int64)
+    year = np.empty(n, dtype=np.int64)
+    for i in prange(n):
+        days = ts_ns[i] // _NS_PER_DAY
+        hour[i] = (ts_ns[i] - days * _NS_PER_DAY) // _NS_PER_HOUR
+        # 1970-01-01 was a Thursday
+        day_of_week[i] = (days + 3) % 7
+        
+        # Shift to eras of 400 years starting on 0000-03-01
+        z = days + 719468
+        era = z // 146097
+        doe = z - era * 146097
+        yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+        doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+        mp = (5 * doy + 2) // 153
+        m = mp + 3 if mp < 10 else mp - 9
+        month[i] = m
+        year[i] = yoe + era * 400 + (1 if m <= 2 else 0)
+    return hour, day_of_week, month, year
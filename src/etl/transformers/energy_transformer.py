@@ -9,9 +9,17 @@ import pandas as pd
 import numpy as np
 import logging
 from ..base import BaseTransformer
+from ._kernels import calendar_fields
 
 logger = logging.getLogger(__name__)
 
+# Season for each month number; index 0 is unused so months index directly
+_SEASON_BY_MONTH = np.array([
+    'winter',
+    'winter', 'winter', 'spring', 'spring', 'spring', 'summer',
+    'summer', 'summer', 'autumn', 'autumn', 'autumn', 'winter'
+])
+
 class EnergyConsumptionTransformer(BaseTransformer):
     """Transformer for energy consumption data."""
     
@@ -45,17 +53,24 @@ class EnergyConsumptionTransformer(BaseTransformer):
         self.stats['total_records'] = len(data)
         transformed = []
         
-        for row in data:
+        # Coerce and range-check consumption for the whole batch in one pass
+        consumption = self._to_float_array([row.get('consumption_mwh') for row in data])
+        valid_consumption = (
+            (consumption >= self.min_consumption) & (consumption <= self.max_consumption)
+        )
+        
+        for i, row in enumerate(data):
             try:
                 # Convert and validate data types
                 timestamp = self._parse_timestamp(row.get('timestamp'))
-                consumption = self._validate_consumption(row.get('consumption_mwh'))
+                if not valid_consumption[i]:
+                    raise ValueError(f"Invalid consumption value: {row.get('consumption_mwh')}")
                 temperature = self._parse_float(row.get('temperature'), default=0.0)
                 is_holiday = bool(int(row.get('is_holiday', 0)))
                 
                 transformed_row = {
                     'timestamp': timestamp,
-                    'consumption_mwh': consumption,
+                    'consumption_mwh': float(consumption[i]),
                     'region': self.region or row.get('region', 'unknown').lower().strip(),
                     'temperature': temperature,
                     'is_holiday': is_holiday,
@@ -63,9 +78,6 @@ class EnergyConsumptionTransformer(BaseTransformer):
                     'data_quality_score': self._calculate_quality_score(row)
                 }
                 
-                # Add derived features
-                transformed_row.update(self._add_derived_features(transformed_row))
-                
                 transformed.append(transformed_row)
                 self.stats['transformed_records'] += 1
                 
@@ -78,6 +90,9 @@ class EnergyConsumptionTransformer(BaseTransformer):
                 logger.warning(f"Error transforming row: {str(e)}")
                 continue
         
+        # Add derived features for all valid rows at once
+        self._add_derived_features(transformed)
+        
         logger.info(f"Transformation complete. {self.stats['transformed_records']} records processed successfully.")
         if self.stats['invalid_records'] > 0:
             logger.warning(f"Found {self.stats['invalid_records']} invalid records.")
@@ -101,18 +116,10 @@ class EnergyConsumptionTransformer(BaseTransformer):
                 
         raise ValueError(f"Could not parse timestamp: {timestamp_str}")
     
-    def _validate_consumption(self, value: Any) -> float:
-        """Validate and convert consumption value."""
-        try:
-            consumption = float(value)
-            if not (self.min_consumption <= consumption <= self.max_consumption):
-                raise ValueError(
-                    f"Consumption {consumption} is outside valid range "
-                    f"[{self.min_consumption}, {self.max_consumption}]"
-                )
-            return consumption
-        except (TypeError, ValueError) as e:
-            raise ValueError(f"Invalid consumption value: {value}") from e
+    @staticmethod
+    def _to_float_array(values: List[Any]) -> np.ndarray:
+        """Convert values to a float array; unparseable values become NaN."""
+        return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype=np.float64)
     
     def _parse_float(self, value: Any, default: float = 0.0) -> float:
         """Safely parse a float value with a default."""
@@ -132,30 +139,43 @@ class EnergyConsumptionTransformer(BaseTransformer):
         
         return max(0.0, min(1.0, score))
     
-    def _add_derived_features(self, row: Dict[str, Any]) -> Dict[str, Any]:
-        """Add derived features to the row."""
-        timestamp = row['timestamp']
+    def _add_derived_features(self, rows: List[Dict[str, Any]]) -> None:
+        """Add derived calendar features to the rows in place."""
+        if not rows:
+            return
         
-        return {
-            'hour_of_day': timestamp.hour,
-            'day_of_week': timestamp.weekday(),
-            'is_weekend': timestamp.weekday() >= 5,
-            'month': timestamp.month,
-            'year': timestamp.year,
-            'season': self._get_season(timestamp.month)
-        }
+        timestamps = pd.DatetimeIndex([row['timestamp'] for row in rows])
+        if timestamps.tz is not None:
+            # Calendar fields are taken from the local wall time
+            timestamps = timestamps.tz_localize(None)
+        hour, day_of_week, month, year = calendar_fields(timestamps.asi8)
+        
+        features = zip(
+            hour.tolist(),
+            day_of_week.tolist(),
+            (day_of_week >= 5).tolist(),
+            month.tolist(),
+            year.tolist(),
+            _SEASON_BY_MONTH[month].tolist()
+        )
+        for row, (hour, weekday, is_weekend, month_, year, season) in zip(rows, features):
+            row.update({
+                'hour_of_day': hour,
+                'day_of_week': weekday,
+                'is_weekend': is_weekend,
+                'month': month_,
+                'year': year,
+                'season': season
+            })
     
     @staticmethod
     def _get_season(month: int) -> str:
         """Get season based on month."""
-        if 3 <= month <= 5:
-            return 'spring'
-        elif 6 <= month <= 8:
-            return 'summer'
-        elif 9 <= month <= 11:
-            return 'autumn'
-        else:
-            return 'winter'
+        return str(_SEASON_BY_MONTH[month])
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics about the transformation process."""
+        return self.get_transformation_stats()
     
     def get_transformation_stats(self) -> Dict[str, Any]:
         """Get statistics about the transformation process."""
@@ -4,19 +4,30 @@ ETL Utilities
 This module contains utility functions for the ETL pipeline.
 """
 import os
+import io
 import json
 import logging
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
 from datetime import datetime, date, time
 from pathlib import Path
+from itertools import islice
 import gzip
 import pickle
 import hashlib
 import pandas as pd
 import numpy as np
+from pandas.api.types import is_datetime64_any_dtype
 
 logger = logging.getLogger(__name__)
 
+# ISO 8601 format used when serializing whole datetime arrays at once;
+# whole-second values drop the fraction and aware values get their offset,
+# as datetime.isoformat() does
+_ISO_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+# Read gzip files in 1 MiB blocks rather than the decompressor's small default reads
+_GZIP_READ_BUFFER_SIZE = 1 << 20
+
 def ensure_directory_exists(directory: Union[str, Path]) -> Path:
     """Ensure that a directory exists, creating it if necessary.
     
@@ -66,8 +77,9 @@ def load_json(filepath: Union[str, Path]) -> Any:
     filepath = Path(filepath)
     
     if filepath.suffix == '.gz' or filepath.suffixes[-1] == '.gz':
-        with gzip.open(filepath, 'rt', encoding='utf-8') as f:
-            return json.load(f)
+        with gzip.open(filepath, 'rb') as gz:
+            buffered = io.BufferedReader(gz, buffer_size=_GZIP_READ_BUFFER_SIZE)
+            return json.load(io.TextIOWrapper(buffered, encoding='utf-8'))
     else:
         with open(filepath, 'r', encoding='utf-8') as f:
             return json.load(f)
@@ -106,8 +118,8 @@ def load_pickle(filepath: Union[str, Path]) -> Any:
     filepath = Path(filepath)
     
     if filepath.suffix == '.gz' or filepath.suffixes[-1] == '.gz':
-        with gzip.open(filepath, 'rb') as f:
-            return pickle.load(f)
+        with gzip.open(filepath, 'rb') as gz:
+            return pickle.load(io.BufferedReader(gz, buffer_size=_GZIP_READ_BUFFER_SIZE))
     else:
         with open(filepath, 'rb') as f:
             return pickle.load(f)
@@ -131,16 +143,27 @@ def calculate_md5(filepath: Union[str, Path], chunk_size: int = 8192) -> str:
     
     return hash_md5.hexdigest()
 
+def _iso_strings(values: pd.Series) -> pd.Series:
+    """Format a datetime Series like isoformat(), with None for NaT."""
+    text = values.dt.strftime(_ISO_FORMAT).str.replace('.000000', '', regex=False)
+    if values.dt.tz is not None:
+        offsets = values.dt.strftime('%z')
+        text = text + offsets.str[:3] + ':' + offsets.str[3:]
+    return text.astype(object).where(values.notna(), None)
+
 def _json_serializer(obj: Any) -> Any:
     """JSON serializer for objects not serializable by default."""
+    # Checks are ordered by how often each type shows up in our payloads
     if isinstance(obj, (datetime, date, time)):
         return obj.isoformat()
-    elif isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
+    elif isinstance(obj, (np.integer, np.floating, np.bool_)):
+        return obj.item()
     elif isinstance(obj, np.ndarray):
         return obj.tolist()
+    elif isinstance(obj, pd.DatetimeIndex):
+        return _iso_strings(obj.to_series()).tolist()
+    elif isinstance(obj, pd.Series) and is_datetime64_any_dtype(obj):
+        return _iso_strings(obj).to_dict()
     elif hasattr(obj, 'to_dict'):
         return obj.to_dict()
     elif hasattr(obj, 'dict'):
@@ -149,22 +172,44 @@ def _json_serializer(obj: Any) -> Any:
         return obj.decode('utf-8', 'ignore')
     elif isinstance(obj, (set, frozenset)):
         return list(obj)
-    elif pd.isna(obj):
+    elif obj is pd.NA or (isinstance(obj, float) and obj != obj):
         return None
     
     raise TypeError(f"Type {type(obj)} not serializable")
 
-def chunk_list(lst: List[Any], chunk_size: int) -> List[List[Any]]:
-    """Split a list into chunks of the specified size.
+def chunk_list(lst: Iterable[Any], chunk_size: int) -> Iterator[List[Any]]:
+    """Split an iterable into chunks of the specified size.
+    
+    Chunks are produced lazily, so only one chunk is held in memory at a time.
     
     Args:
-        lst: List to split
+        lst: Iterable to split
         chunk_size: Maximum size of each chunk
         
-    Returns:
-        List of chunks
+    Yields:
+        Lists of at most chunk_size items
+    """
+    it = iter(lst)
+    while True:
+        batch = list(islice(it, chunk_size))
+        if not batch:
+            return
+        yield batch
+
+def chunk_array(arr: np.ndarray, chunk_size: int) -> Iterator[np.ndarray]:
+    """Split a numpy array into chunks of the specified size.
+    
+    Each chunk is a view onto the input array, so no data is copied.
+    
+    Args:
+        arr: Array to split along its first axis
+        chunk_size: Maximum size of each chunk
+        
+    Yields:
+        Array views of at most chunk_size rows
     """
-    return [lst[i:i + chunk_size] for i in range(0, len(lst), chunk_size)]
+    for i in range(0, len(arr), chunk_size):
+        yield arr[i:i + chunk_size]
 
 def format_bytes(size: float) -> str:
     """Format a size in bytes as a human-readable string.
@@ -1,8 +1,10 @@
 from fastapi import FastAPI, HTTPException, Depends, Query, Body, Path, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 import pandas as pd
@@ -10,6 +12,8 @@ import pandas as pd
 # Import models and database
 from .models.energy_models import EnergyConsumption, PowerPlant, Anomaly, User
 from .config.database import get_db_session, init_db
+from .config.settings import settings
+from .ml.service import MLService
 from .auth.auth_utils import (
     get_password_hash,
     get_current_active_user,
@@ -55,7 +59,8 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
-    openapi_url="/api/openapi.json"
+    openapi_url="/api/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
 # Include routers
@@ -73,6 +78,12 @@ app.add_middleware(
     expose_headers=["Content-Disposition"]
 )
 
+@app.on_event("startup")
+def warmup_ml_models():
+    """Warm up the forecasting models before serving traffic"""
+    if settings.ML_WARMUP_ON_STARTUP:
+        MLService.warmup()
+
 # API Endpoints
 @app.get("/api/")
 async def read_root():
@@ -129,27 +140,27 @@ async def get_consumption(
     Get energy consumption data for a date range and optional region
     """
     try:
-        query = db.query(EnergyConsumption).filter(
+        query = db.query(
+            EnergyConsumption.id,
+            EnergyConsumption.timestamp,
+            EnergyConsumption.region,
+            EnergyConsumption.consumption_mwh,
+            EnergyConsumption.temperature,
+            EnergyConsumption.is_holiday,
+            EnergyConsumption.created_at
+        ).filter(
             EnergyConsumption.timestamp >= start_date,
             EnergyConsumption.timestamp <= end_date
         )
         
         if region:
             query = query.filter(EnergyConsumption.region == region)
-            
-        records = query.all()
         
-        return [
-            {
-                "id": r.id,
-                "timestamp": r.timestamp,
-                "region": r.region,
-                "consumption_mwh": r.consumption_mwh,
-                "temperature": r.temperature,
-                "is_holiday": r.is_holiday,
-                "created_at": r.created_at
-            } for r in records
-        ]
+        # Read the rows straight into a DataFrame to skip ORM object hydration
+        df = pd.read_sql(query.statement, db.bind)
+        
+        # Nullable columns come back as NaN; map them to None for JSON output
+        return df.astype(object).where(df.notna(), None).to_dict('records')
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -208,12 +219,12 @@ async def get_consumption_summary(
     try:
         query = db.query(
             EnergyConsumption.region,
-            db.func.count(EnergyConsumption.id).label("count"),
-            db.func.sum(EnergyConsumption.consumption_mwh).label("total_consumption"),
-            db.func.avg(EnergyConsumption.consumption_mwh).label("avg_consumption"),
-            db.func.min(EnergyConsumption.consumption_mwh).label("min_consumption"),
-            db.func.max(EnergyConsumption.consumption_mwh).label("max_consumption"),
-            db.func.avg(EnergyConsumption.temperature).label("avg_temperature")
+            func.count(EnergyConsumption.id).label("count"),
+            func.sum(EnergyConsumption.consumption_mwh).label("total_consumption"),
+            func.avg(EnergyConsumption.consumption_mwh).label("avg_consumption"),
+            func.min(EnergyConsumption.consumption_mwh).label("min_consumption"),
+            func.max(EnergyConsumption.consumption_mwh).label("max_consumption"),
+            func.avg(EnergyConsumption.temperature).label("avg_temperature")
         ).filter(
             EnergyConsumption.timestamp >= start_date,
             EnergyConsumption.timestamp <= end_date
@@ -222,19 +233,23 @@ async def get_consumption_summary(
         if region:
             query = query.filter(EnergyConsumption.region == region)
             
-        results = query.group_by(EnergyConsumption.region).all()
+        df = pd.read_sql(query.group_by(EnergyConsumption.region).statement, db.bind)
+        
+        # Null aggregates become 0, except avg_temperature which stays null
+        df = df.fillna({
+            "total_consumption": 0,
+            "avg_consumption": 0,
+            "min_consumption": 0,
+            "max_consumption": 0
+        }).astype({
+            "total_consumption": "float64",
+            "avg_consumption": "float64",
+            "min_consumption": "float64",
+            "max_consumption": "float64",
+            "avg_temperature": "float64"
+        })
         
-        return [
-            {
-                "region": r.region,
-                "count": r.count,
-                "total_consumption": float(r.total_consumption) if r.total_consumption else 0,
-                "avg_consumption": float(r.avg_consumption) if r.avg_consumption else 0,
-                "min_consumption": float(r.min_consumption) if r.min_consumption else 0,
-                "max_consumption": float(r.max_consumption) if r.max_consumption else 0,
-                "avg_temperature": float(r.avg_temperature) if r.avg_temperature else None
-            } for r in results
-        ]
+        return df.astype(object).where(df.notna(), None).to_dict('records')
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,33 @@
+"""Numba kernels for the ML hot paths."""
+import numpy as np
+from numba import njit, prange
+
+@njit(cache=True, parallel=True)
+def anomaly_mask(errors: np.ndarray, threshold_std: float) -> np.ndarray:
+    """
+    Flag errors more than threshold_std standard deviations from their mean.
+    
+    Equivalent to np.abs(errors - errors.mean()) > threshold_std * errors.std(),
+    but computes the mean and variance in a single Welford pass and writes the
+    mask without allocating intermediate arrays.
+    
+    Args:
+        errors: 1-D array of prediction errors
+        threshold_std: Number of standard deviations to use as threshold
+        
+    Returns:
+        Boolean array, True where the error is anomalous
+    """
+    n = errors.shape[0]
+    mean = 0.0
+    m2 = 0.0
+    for i in range(n):
+        delta = errors[i] - mean
+        mean += delta / (i + 1)
+        m2 += delta * (errors[i] - mean)
+    threshold = threshold_std * np.sqrt(m2 / n)
+    
+    mask = np.empty(n, dtype=np.bool_)
+    for i in prange(n):
+        mask[i] = abs(errors[i] - mean) > threshold
+    return mask
@@ -78,7 +78,7 @@ class AnomalyDetector:
             threshold_std: Number of standard deviations to use as threshold
             
         Returns:
-            DataFrame with anomaly information
+            DataFrame with anomaly information for every row
         """
         if self.model is None:
             raise ValueError("Model has not been fitted. Call fit() first.")
@@ -89,11 +89,14 @@ class AnomalyDetector:
                 df, time_col=time_col, value_cols=value_col
             )
             
-            # Scale the data
-            scaled_series = self.scaler.transform(series)
-            
-            # Make predictions
-            predictions = self.model.predict(len(series))
+            # Prophet is a curve fit over time, so the underlying model gives
+            # the expected value at each row's own timestamp, in-sample or not.
+            # A darts forecast would instead start after the training data and
+            # be compared against the wrong rows.
+            fitted = self.model.model.predict(pd.DataFrame({'ds': series.time_index}))
+            predictions = TimeSeries.from_times_and_values(
+                series.time_index, fitted['yhat'].to_numpy(), columns=series.columns
+            )
             predictions = self.scaler.inverse_transform(predictions)
             
             # Detect anomalies
@@ -139,12 +142,15 @@ class AnomalyDetector:
             logger.error(f"Error evaluating model: {str(e)}")
             raise
     
-    def save_model(self, filepath: str) -> None:
+    def save_model(self, filepath: str, compress: int = 0) -> None:
         """
         Save the trained model to a file.
         
         Args:
             filepath: Path to save the model
+            compress: joblib compression level (0-9). Keep at 0 for models
+                that are reloaded often, since compressed files cannot be
+                memory-mapped by load_model.
         """
         if self.model is None:
             raise ValueError("No model to save. Fit the model first.")
@@ -155,19 +161,21 @@ class AnomalyDetector:
                 'model': self.model,
                 'scaler': self.scaler,
                 'model_params': self.model_params
-            }, filepath)
+            }, filepath, compress=compress)
             
         except Exception as e:
             logger.error(f"Error saving model: {str(e)}")
             raise
     
     @classmethod
-    def load_model(cls, filepath: str) -> 'AnomalyDetector':
+    def load_model(cls, filepath: str, mmap_mode: Optional[str] = 'r') -> 'AnomalyDetector':
         """
         Load a trained model from a file.
         
         Args:
             filepath: Path to the saved model
+            mmap_mode: Memory-map numpy arrays in uncompressed files instead
+                of copying them into memory. Pass None to load a private copy.
             
         Returns:
             AnomalyDetector instance with loaded model
@@ -176,7 +184,7 @@ class AnomalyDetector:
             import joblib
             
             # Load the model and parameters
-            data = joblib.load(filepath)
+            data = joblib.load(filepath, mmap_mode=mmap_mode)
             
             # Create a new instance
             detector = cls(model_params=data.get('model_params', {}))
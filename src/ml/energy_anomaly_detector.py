@@ -5,6 +5,7 @@ from datetime import datetime
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import classification_report, confusion_matrix
+import joblib
 import logging
 
 logger = logging.getLogger(__name__)
@@ -32,6 +33,7 @@ class EnergyAnomalyDetector:
             self.contamination = kwargs.get('contamination', 0.1)
             self.n_estimators = kwargs.get('n_estimators', 100)
             self.random_state = kwargs.get('random_state', 42)
+            self.max_samples = kwargs.get('max_samples', 4096)  # Capped at the number of rows
         elif method == 'statistical':
             self.z_threshold = kwargs.get('z_threshold', 3.0)
             self.window_size = kwargs.get('window_size', 24)  # 24 hours
@@ -83,10 +85,16 @@ class EnergyAnomalyDetector:
                 # Scale features
                 X_scaled = self.scaler.fit_transform(X)
                 
+                # Cache scaler statistics so predict() can normalize in place
+                self._mean = self.scaler.mean_.astype(np.float32)
+                self._scale = self.scaler.scale_.astype(np.float32)
+                
                 # Train Isolation Forest
                 self.model = IsolationForest(
                     contamination=self.contamination,
                     n_estimators=self.n_estimators,
+                    max_samples=min(self.max_samples, len(X_scaled)),
+                    bootstrap=False,
                     random_state=self.random_state,
                     n_jobs=-1
                 )
@@ -121,9 +129,13 @@ class EnergyAnomalyDetector:
             
             # Make predictions
             if self.method == 'isolation_forest':
-                X_scaled = self.scaler.transform(X)
+                # Normalize in place on a float32 copy (the trees work in float32)
+                X_scaled = X.to_numpy(dtype=np.float32, copy=True)
+                X_scaled -= self._mean
+                X_scaled /= self._scale
                 anomaly_scores = self.model.decision_function(X_scaled)
-                is_anomaly = self.model.predict(X_scaled) == -1
+                # IsolationForest.predict() flags negative decision scores
+                is_anomaly = anomaly_scores < 0
                 
             elif self.method == 'statistical':
                 # Z-score based detection
@@ -180,3 +192,45 @@ class EnergyAnomalyDetector:
             'recall': report['True']['recall'] if 'True' in report else 0,
             'f1_score': report['True']['f1-score'] if 'True' in report else 0
         }
+    
+    def save_model(self, filepath: str) -> None:
+        """
+        Save the fitted detector to a file.
+        
+        The file is written uncompressed so that load_model can memory-map it.
+        
+        Args:
+            filepath: Path to save the detector
+        """
+        if not self.is_fitted:
+            raise ValueError("No model to save. Fit the model first.")
+        
+        try:
+            joblib.dump(self, filepath)
+        except Exception as e:
+            logger.error(f"Error saving anomaly detector: {str(e)}")
+            raise
+    
+    @classmethod
+    def load_model(cls, filepath: str, mmap_mode: Optional[str] = 'r') -> 'EnergyAnomalyDetector':
+        """
+        Load a fitted detector from a file.
+        
+        Args:
+            filepath: Path to the saved detector
+            mmap_mode: Memory-map the numpy arrays (scaler statistics, tree
+                nodes) read-only instead of copying them; for a file on tmpfs
+                (e.g. /dev/shm) processes loading it share the same pages.
+                Pass None to load a private copy.
+            
+        Returns:
+            EnergyAnomalyDetector instance
+        """
+        try:
+            detector = joblib.load(filepath, mmap_mode=mmap_mode)
+            if not isinstance(detector, cls):
+                raise TypeError(f"{filepath} does not contain an {cls.__name__}")
+            return detector
+        except Exception as e:
+            logger.error(f"Error loading anomaly detector: {str(e)}")
+            raise
@@ -2,13 +2,91 @@ from typing import Dict, Any, Optional, List, Tuple
 import pandas as pd
 import numpy as np
 from darts import TimeSeries
-from darts.models import Prophet, ExponentialSmoothing, ARIMA
-from darts.metrics import mae, mse, rmse, mape
+from darts.models import Prophet, ExponentialSmoothing, ARIMA, StatsForecastAutoETS
 from darts.dataprocessing.transformers import Scaler
+from joblib import Parallel, delayed
 import logging
 
+from .utils import compute_metrics, to_time_series
+
 logger = logging.getLogger(__name__)
 
+def _build_model(model_type: str, model_params: Dict[str, Any]):
+    """Build an unfitted model of the given type."""
+    if model_type == 'prophet':
+        return Prophet(**model_params)
+    elif model_type == 'exponential_smoothing':
+        return ExponentialSmoothing(**model_params)
+    elif model_type == 'arima':
+        return ARIMA(**model_params)
+    elif model_type == 'ets_fast':
+        # statsforecast's numba-compiled AutoETS with a daily cycle on hourly data
+        return StatsForecastAutoETS(**{'season_length': 24, **model_params})
+    else:
+        raise ValueError(f"Unsupported model type: {model_type}")
+
+def _scaler_path(filepath: str) -> str:
+    """Path of the scaler state stored alongside a saved model."""
+    return f"{filepath}.scaler.npz"
+
+def _scaler_from_range(data_min: np.ndarray, data_max: np.ndarray) -> Scaler:
+    """
+    Rebuild a fitted min/max Scaler from its per-component data range.
+    
+    Fitting on the two extreme rows reproduces the original scaler state.
+    """
+    scaler = Scaler()
+    scaler.fit(TimeSeries.from_values(np.vstack([data_min, data_max])))
+    return scaler
+
+def _safe_range(data_min: np.ndarray, data_max: np.ndarray) -> np.ndarray:
+    """Data range with zeros replaced by one, as sklearn's MinMaxScaler does."""
+    data_range = data_max - data_min
+    return np.where(data_range == 0, 1.0, data_range)
+
+def _inverse_min_max(values: np.ndarray, data_min: np.ndarray,
+                     data_max: np.ndarray) -> np.ndarray:
+    """
+    Undo min/max scaling on raw values.
+    
+    Equivalent to Scaler.inverse_transform without wrapping the values in a
+    TimeSeries.
+    """
+    return values * _safe_range(data_min, data_max) + data_min
+
+def _run_fold(times: pd.DatetimeIndex, values: np.ndarray, freq: str,
+              model_type: str, model_params: Dict[str, Any],
+              train_size: int, data_min: np.ndarray,
+              data_max: np.ndarray) -> Dict[str, float]:
+    """
+    Train and score one cross-validation fold.
+    
+    Kept at module level so joblib can pickle it for worker processes. The
+    fold is cut from the raw index and values rather than by slicing a
+    TimeSeries, and min/max scaling uses the training prefix's precomputed
+    range directly on the arrays.
+    
+    Returns:
+        Dictionary of evaluation metrics for the fold
+    """
+    test = values[train_size:]
+    
+    # Scale the data
+    scaled_train = TimeSeries.from_times_and_values(
+        times[:train_size],
+        (values[:train_size] - data_min) / _safe_range(data_min, data_max),
+        freq=freq
+    )
+    
+    # Train model
+    model = _build_model(model_type, model_params)
+    model.fit(scaled_train)
+    
+    # Make predictions
+    predictions = model.predict(len(test)).values(copy=False)
+    
+    return compute_metrics(test, _inverse_min_max(predictions, data_min, data_max))
+
 class EnergyForecaster:
     """
     A class for forecasting energy consumption using multiple models.
@@ -19,7 +97,7 @@ class EnergyForecaster:
         Initialize the forecaster.
         
         Args:
-            model_type: Type of model to use ('prophet', 'exponential_smoothing', 'arima')
+            model_type: Type of model to use ('prophet', 'exponential_smoothing', 'arima', 'ets_fast')
             model_params: Parameters for the model
         """
         self.model_type = model_type.lower()
@@ -28,17 +106,16 @@ class EnergyForecaster:
         self.scaler = Scaler()
         self.train_series = None
         self.test_series = None
+        self._test_predictions = None
     
     def _get_model(self):
         """Get the appropriate model based on model_type."""
-        if self.model_type == 'prophet':
-            return Prophet(**self.model_params)
-        elif self.model_type == 'exponential_smoothing':
-            return ExponentialSmoothing(**self.model_params)
-        elif self.model_type == 'arima':
-            return ARIMA(**self.model_params)
-        else:
-            raise ValueError(f"Unsupported model type: {self.model_type}")
+        return _build_model(self.model_type, self.model_params)
+    
+    def _inverse_scale(self, values: np.ndarray) -> np.ndarray:
+        """Undo the fitted min/max scaling on raw values."""
+        fitted = self.scaler._fitted_params[0]
+        return _inverse_min_max(values, fitted.data_min_, fitted.data_max_)
     
     def fit(self, df: pd.DataFrame, time_col: str = 'timestamp', 
             value_col: str = 'consumption_mwh', test_size: float = 0.2) -> 'EnergyForecaster':
@@ -56,9 +133,7 @@ class EnergyForecaster:
         """
         try:
             # Create time series
-            series = TimeSeries.from_dataframe(
-                df, time_col=time_col, value_cols=value_col
-            )
+            series = to_time_series(df, time_col, value_col)
             
             # Split into train/test
             train_size = int(len(series) * (1 - test_size))
@@ -72,6 +147,9 @@ class EnergyForecaster:
             self.model = self._get_model()
             self.model.fit(scaled_train)
             
+            # Invalidate the test forecast cached by evaluate()
+            self._test_predictions = None
+            
             return self
             
         except Exception as e:
@@ -115,81 +193,79 @@ class EnergyForecaster:
             raise ValueError("Model has not been fitted. Call fit() first.")
             
         try:
-            # Make predictions on test set
-            predictions = self.model.predict(len(self.test_series))
-            
-            # Inverse transform the predictions and actual values
-            predictions = self.scaler.inverse_transform(predictions)
-            actual = self.scaler.inverse_transform(self.test_series)
-            
-            # Calculate metrics
-            metrics = {
-                'mae': mae(actual, predictions),
-                'mse': mse(actual, predictions),
-                'rmse': rmse(actual, predictions),
-                'mape': mape(actual, predictions)
-            }
+            # Forecast the test set once per fit; the model is deterministic
+            if self._test_predictions is None:
+                predictions = self.model.predict(len(self.test_series))
+                self._test_predictions = self._inverse_scale(predictions.values(copy=False))
             
-            return metrics
+            # test_series is kept unscaled, so compare against it directly
+            return compute_metrics(
+                self.test_series.values(copy=False), self._test_predictions
+            )
             
         except Exception as e:
             logger.error(f"Error evaluating model: {str(e)}")
             raise
     
     def cross_validate(self, df: pd.DataFrame, time_col: str = 'timestamp', 
-                      value_col: str = 'consumption_mwh', n_splits: int = 5) -> Dict[str, List[float]]:
+                      value_col: str = 'consumption_mwh', n_splits: int = 5,
+                      n_jobs: int = -1) -> Dict[str, List[float]]:
         """
         Perform time series cross-validation.
         
+        Folds are independent, so they are trained in parallel worker processes.
+        
         Args:
             df: DataFrame containing the time series data
             time_col: Name of the timestamp column
             value_col: Name of the value column
             n_splits: Number of splits for cross-validation
+            n_jobs: Number of worker processes (-1 uses all cores)
             
         Returns:
             Dictionary of evaluation metrics for each fold
         """
-        from darts.utils.model_selection import train_test_split
-        
         try:
             # Create time series
-            series = TimeSeries.from_dataframe(
-                df, time_col=time_col, value_cols=value_col
+            series = to_time_series(df, time_col, value_col)
+            
+            # Extract the raw index and values once; each fold slices them
+            times = series.time_index
+            values = series.values(copy=False)
+            
+            # Training sets are growing prefixes, so one running min/max pass
+            # gives every fold's scaler range
+            running_min = np.minimum.accumulate(values, axis=0)
+            running_max = np.maximum.accumulate(values, axis=0)
+            train_sizes = [
+                int(len(series) * (i + 1) / (n_splits + 1)) for i in range(n_splits)
+            ]
+            
+            # Perform time series cross-validation
+            fold_results = Parallel(n_jobs=n_jobs, backend='loky')(
+                delayed(_run_fold)(
+                    times,
+                    values,
+                    series.freq_str,
+                    self.model_type,
+                    self.model_params,
+                    train_size,
+                    running_min[train_size - 1],
+                    running_max[train_size - 1]
+                )
+                for train_size in train_sizes
             )
             
-            # Initialize metrics storage
+            # Collect metrics per fold
             metrics = {
                 'mae': [],
                 'mse': [],
                 'rmse': [],
                 'mape': []
             }
-            
-            # Perform time series cross-validation
-            for i in range(n_splits):
-                # Split data
-                train_size = int(len(series) * (i + 1) / (n_splits + 1))
-                train, test = series[:train_size], series[train_size:]
-                
-                # Scale the data
-                scaler = Scaler()
-                scaled_train = scaler.fit_transform(train)
-                
-                # Train model
-                model = self._get_model()
-                model.fit(scaled_train)
-                
-                # Make predictions
-                predictions = model.predict(len(test))
-                predictions = scaler.inverse_transform(predictions)
-                actual = scaler.inverse_transform(test)
-                
-                # Calculate metrics
-                metrics['mae'].append(mae(actual, predictions))
-                metrics['mse'].append(mse(actual, predictions))
-                metrics['rmse'].append(rmse(actual, predictions))
-                metrics['mape'].append(mape(actual, predictions))
+            for fold_metrics in fold_results:
+                for name, value in fold_metrics.items():
+                    metrics[name].append(value)
             
             return metrics
             
@@ -211,11 +287,18 @@ class EnergyForecaster:
             import joblib
             joblib.dump({
                 'model': self.model,
-                'scaler': self.scaler,
                 'model_type': self.model_type,
                 'model_params': self.model_params
             }, filepath)
             
+            # The fitted min/max scaler is fully described by its data range
+            fitted = self.scaler._fitted_params[0]
+            np.savez(
+                _scaler_path(filepath),
+                data_min=fitted.data_min_.astype(np.float32),
+                data_max=fitted.data_max_.astype(np.float32)
+            )
+            
         except Exception as e:
             logger.error(f"Error saving model: {str(e)}")
             raise
@@ -243,7 +326,15 @@ class EnergyForecaster:
                 model_params=data.get('model_params', {})
             )
             forecaster.model = data['model']
-            forecaster.scaler = data['scaler']
+            
+            if 'scaler' in data:
+                # Models saved before the scaler moved to its own file
+                forecaster.scaler = data['scaler']
+            else:
+                with np.load(_scaler_path(filepath)) as stats:
+                    forecaster.scaler = _scaler_from_range(
+                        stats['data_min'], stats['data_max']
+                    )
             
             return forecaster
             
@@ -2,16 +2,30 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
 import logging
 
 from .anomaly_detection import AnomalyDetector
 from .forecasting import EnergyForecaster
+from ._kernels import anomaly_mask
 from ..models.energy_models import EnergyConsumption, Anomaly
 from ..config.database import get_db_session
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round trip when loading consumption data
+_READ_CHUNK_SIZE = 100_000
+
+# Rows per executemany when saving anomalies
+_INSERT_BATCH_SIZE = 10_000
+
+# float32 is plenty for MWh and temperature readings and halves their memory
+_CONSUMPTION_DTYPES = {
+    'consumption_mwh': 'float32',
+    'temperature': 'float32'
+}
+
 class MLService:
     """
     Service class for ML operations.
@@ -28,6 +42,32 @@ class MLService:
         self.anomaly_detector = None
         self.forecaster = None
     
+    @staticmethod
+    def warmup() -> None:
+        """
+        Fit each supported forecasting model once on a small synthetic series.
+        
+        Meant to run at process startup, so that model backend initialisation
+        and numba compilation happen before the first real request.
+        """
+        periods = 72  # Three daily cycles, enough for seasonal exponential smoothing
+        df = pd.DataFrame({
+            'timestamp': pd.date_range('2000-01-01', periods=periods, freq='H'),
+            'consumption_mwh': (
+                100 + 10 * np.sin(np.arange(periods) / 24 * 2 * np.pi)
+                + np.random.default_rng(0).normal(0, 1, periods)  # ARIMA fails on a noiseless series
+            )
+        })
+        
+        for model_type in ('prophet', 'exponential_smoothing', 'arima', 'ets_fast'):
+            try:
+                EnergyForecaster(model_type=model_type).fit(df).predict(4)
+            except Exception as e:
+                logger.warning(f"Warmup failed for {model_type} model: {str(e)}")
+        
+        anomaly_mask(np.zeros(2), 2.0)
+        logger.info("ML models warmed up")
+    
     def load_consumption_data(self, start_date: datetime, end_date: datetime, 
                              region: Optional[str] = None) -> pd.DataFrame:
         """
@@ -50,10 +90,20 @@ class MLService:
             if region:
                 query = query.filter(EnergyConsumption.region == region)
             
-            # Execute query and convert to DataFrame
-            df = pd.read_sql(query.statement, self.db.bind)
+            # Stream rows through a server-side cursor in chunks, narrowing
+            # the float columns as each chunk is built
+            chunks = list(pd.read_sql_query(
+                query.statement.execution_options(stream_results=True),
+                self.db.connection(),
+                parse_dates=['timestamp'],
+                dtype=_CONSUMPTION_DTYPES,
+                chunksize=_READ_CHUNK_SIZE
+            ))
             
-            return df
+            if not chunks:
+                return pd.DataFrame()
+            
+            return pd.concat(chunks, ignore_index=True, copy=False)
             
         except Exception as e:
             logger.error(f"Error loading consumption data: {str(e)}")
@@ -81,14 +131,15 @@ class MLService:
                 return {"error": "No data found for the specified criteria"}
             
             # Initialize and train anomaly detector
-            self.anomaly_detector = AnomalyDetector(**kwargs.get('model_params', {}))
+            self.anomaly_detector = AnomalyDetector(model_params=kwargs.get('model_params'))
             self.anomaly_detector.fit(df, **kwargs.get('fit_params', {}))
             
             # Detect anomalies
             anomalies = self.anomaly_detector.predict(df, **kwargs.get('predict_params', {}))
             
-            # Save anomalies to database
-            self._save_anomalies(anomalies, region)
+            # Save anomalies to database; nothing to write for clean data
+            if anomalies.attrs.get('any_anomaly', True):
+                self._save_anomalies(anomalies, region)
             
             # Get evaluation metrics
             metrics = self.anomaly_detector.evaluate()
@@ -113,7 +164,8 @@ class MLService:
             end_date: End date for the training data
             n_periods: Number of periods to forecast
             region: Optional region filter
-            model_type: Type of model to use ('prophet', 'exponential_smoothing', 'arima')
+            model_type: Type of model to use ('prophet', 'exponential_smoothing', 'arima',
+                'ets_fast'); 'ets_fast' is much faster than Prophet on hourly data
             **kwargs: Additional arguments for the forecaster
             
         Returns:
@@ -164,19 +216,25 @@ class MLService:
         """
         try:
             # Only process rows marked as anomalies
-            anomalies = anomalies_df[anomalies_df['is_anomaly']]
-            
-            for _, row in anomalies.iterrows():
-                anomaly = Anomaly(
-                    timestamp=row['timestamp'],
-                    region=region,
-                    actual_value=row['actual'],
-                    predicted_value=row['predicted'],
-                    anomaly_score=row['error'],
-                    is_confirmed=0  # 0 for unconfirmed, 1 for confirmed, -1 for false positive
+            mask = anomalies_df['is_anomaly'].to_numpy()
+            if not mask.any():
+                return
+            anomalies = anomalies_df[mask]
+            
+            records = anomalies[['timestamp', 'actual', 'predicted', 'error']].rename(columns={
+                'actual': 'actual_value',
+                'predicted': 'predicted_value',
+                'error': 'anomaly_score'
+            }).assign(
+                region=region,
+                is_confirmed=0  # 0 for unconfirmed, 1 for confirmed, -1 for false positive
+            ).to_dict('records')
+            
+            # Insert in bounded executemany batches within a single transaction
+            for start in range(0, len(records), _INSERT_BATCH_SIZE):
+                self.db.bulk_insert_mappings(
+                    Anomaly, records[start:start + _INSERT_BATCH_SIZE]
                 )
-                self.db.add(anomaly)
-            
             self.db.commit()
             
         except Exception as e:
@@ -198,43 +256,44 @@ class MLService:
             Dictionary with anomaly statistics
         """
         try:
-            query = self.db.query(Anomaly).filter(
+            filters = [
                 Anomaly.timestamp >= start_date,
                 Anomaly.timestamp <= end_date
-            )
+            ]
             
             if region:
-                query = query.filter(Anomaly.region == region)
-            
-            # Get all anomalies
-            anomalies = query.all()
-            
-            if not anomalies:
+                filters.append(Anomaly.region == region)
+            
+            # Aggregate per region in the database; one scan serves both the
+            # totals and the top-region ranking
+            region_name = func.coalesce(Anomaly.region, 'unknown').label('region')
+            region_rows = self.db.query(
+                region_name,
+                func.count(Anomaly.id).label('count'),
+                func.sum(case((Anomaly.is_confirmed == 1, 1), else_=0)).label('confirmed'),
+                func.sum(case((Anomaly.is_confirmed == -1, 1), else_=0)).label('false_positives'),
+                func.sum(Anomaly.anomaly_score).label('score_sum')
+            ).filter(*filters).group_by(region_name).all()
+            
+            if not region_rows:
                 return {"message": "No anomalies found for the specified criteria"}
             
-            # Calculate statistics
-            total_anomalies = len(anomalies)
-            confirmed = sum(1 for a in anomalies if a.is_confirmed == 1)
-            false_positives = sum(1 for a in anomalies if a.is_confirmed == -1)
-            unconfirmed = total_anomalies - confirmed - false_positives
+            # Fold the per-region rows into totals in a single pass
+            total_anomalies = confirmed = false_positives = 0
+            score_sum = 0.0
+            for row in region_rows:
+                total_anomalies += row.count
+                confirmed += row.confirmed
+                false_positives += row.false_positives
+                score_sum += row.score_sum or 0.0
             
-            avg_anomaly_score = sum(a.anomaly_score for a in anomalies) / total_anomalies
+            unconfirmed = total_anomalies - confirmed - false_positives
+            avg_anomaly_score = score_sum / total_anomalies
             
             # Get top regions with most anomalies
-            region_stats = {}
-            for anomaly in anomalies:
-                region = anomaly.region or 'unknown'
-                if region not in region_stats:
-                    region_stats[region] = 0
-                region_stats[region] += 1
-            
             top_regions = [
-                {"region": region, "count": count}
-                for region, count in sorted(
-                    region_stats.items(), 
-                    key=lambda x: x[1], 
-                    reverse=True
-                )[:5]  # Top 5 regions
+                {"region": row.region, "count": row.count}
+                for row in sorted(region_rows, key=lambda row: row.count, reverse=True)[:5]  # Top 5 regions
             ]
             
             return {
@@ -242,7 +301,7 @@ class MLService:
                 "confirmed_anomalies": confirmed,
                 "false_positives": false_positives,
                 "unconfirmed_anomalies": unconfirmed,
-                "avg_anomaly_score": avg_anomaly_score,
+                "avg_anomaly_score": float(avg_anomaly_score),
                 "top_regions": top_regions
             }
             
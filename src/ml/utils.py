@@ -4,11 +4,50 @@ from typing import List, Tuple, Optional
 from darts import TimeSeries
 from darts.models import Prophet
 from darts.dataprocessing.transformers import Scaler
-from darts.metrics import mae, mse, rmse, mape
+from pandas.api.types import is_datetime64_any_dtype
 import logging
 
+from ._kernels import anomaly_mask
+
 logger = logging.getLogger(__name__)
 
+# Below this length the numpy path is faster than dispatching to numba
+_KERNEL_MIN_LENGTH = 10_000
+
+def to_time_series(
+    df: pd.DataFrame,
+    time_col: str = 'timestamp',
+    value_col: str = 'consumption_mwh',
+    freq: Optional[str] = None
+) -> TimeSeries:
+    """
+    Build a single-component float32 TimeSeries from a DataFrame
+    
+    Goes through from_times_and_values to skip the schema inference and
+    value copy done by TimeSeries.from_dataframe.
+    
+    Args:
+        df: DataFrame containing time series data
+        time_col: Name of the timestamp column
+        value_col: Name of the value column
+        freq: Frequency of the time series (inferred if None)
+        
+    Returns:
+        TimeSeries with one component named after value_col
+    """
+    times = df[time_col]
+    if is_datetime64_any_dtype(times):
+        times = pd.DatetimeIndex(times, name=time_col)
+    else:
+        times = pd.DatetimeIndex(pd.to_datetime(times), name=time_col)
+    
+    return TimeSeries.from_times_and_values(
+        times=times,
+        values=df[value_col].to_numpy(dtype=np.float32, copy=False),
+        freq=freq,
+        columns=pd.Index([value_col])
+    )
+
 def prepare_time_series(
     df: pd.DataFrame,
     time_col: str = 'timestamp',
@@ -30,16 +69,8 @@ def prepare_time_series(
         Tuple of (train_series, test_series)
     """
     try:
-        # Ensure timestamp is datetime
-        df[time_col] = pd.to_datetime(df[time_col])
-        
         # Create time series
-        series = TimeSeries.from_dataframe(
-            df,
-            time_col=time_col,
-            value_cols=value_col,
-            freq=freq
-        )
+        series = to_time_series(df, time_col, value_col, freq)
         
         # Split into train/test
         train_size = int(len(series) * (1 - test_size))
@@ -101,25 +132,30 @@ def detect_anomalies(
         DataFrame with anomaly information
     """
     try:
-        # Calculate errors
-        errors = actual - predicted
-        
-        # Calculate threshold
-        mean_error = np.mean(errors.values())
-        std_error = np.std(errors.values())
-        threshold = threshold_std * std_error
-        
-        # Detect anomalies
-        anomalies = abs(errors.values() - mean_error) > threshold
+        # Pull the raw values out once; darts arithmetic is positional anyway
+        actual_values = actual.values(copy=False).ravel()
+        predicted_values = predicted.values(copy=False).ravel()
+        errors = actual_values - predicted_values
+        
+        # Detect anomalies; long series use the fused numba kernel
+        if len(errors) > _KERNEL_MIN_LENGTH:
+            anomalies = anomaly_mask(errors, threshold_std)
+        else:
+            mean_error = errors.mean()
+            threshold = threshold_std * errors.std()
+            anomalies = np.abs(errors - mean_error) > threshold
         
         # Create results DataFrame
         results = pd.DataFrame({
             'timestamp': actual.time_index,
-            'actual': actual.values().flatten(),
-            'predicted': predicted.values().flatten(),
-            'error': errors.values().flatten(),
-            'is_anomaly': anomalies.flatten()
-        })
+            'actual': actual_values,
+            'predicted': predicted_values,
+            'error': errors,
+            'is_anomaly': anomalies
+        }, copy=False)
+        
+        # Let callers skip work on clean data without rescanning the column
+        results.attrs['any_anomaly'] = bool(anomalies.any())
         
         return results
         
@@ -127,11 +163,35 @@ def detect_anomalies(
         logger.error(f"Error detecting anomalies: {str(e)}")
         raise
 
+def compute_metrics(actual: np.ndarray, predicted: np.ndarray) -> dict:
+    """
+    Compute MAE, MSE, RMSE and MAPE in a single pass over the errors
+    
+    Args:
+        actual: Actual values
+        predicted: Predicted values, aligned with actual
+        
+    Returns:
+        Dictionary of evaluation metrics
+    """
+    actual = np.asarray(actual, dtype=np.float32).ravel()
+    errors = actual - np.asarray(predicted, dtype=np.float32).ravel()
+    abs_errors = np.abs(errors)
+    mse_value = float(np.mean(errors * errors))
+    
+    return {
+        'mae': float(np.mean(abs_errors)),
+        'mse': mse_value,
+        'rmse': float(np.sqrt(mse_value)),
+        'mape': float(np.mean(abs_errors / np.maximum(np.abs(actual), 1e-12)) * 100)
+    }
+
 def evaluate_model(
     model: Prophet,
     train_series: TimeSeries,
     test_series: TimeSeries,
-    horizon: int = 24
+    horizon: int = 24,
+    predictions: Optional[TimeSeries] = None
 ) -> dict:
     """
     Evaluate a trained model on test data
@@ -141,23 +201,21 @@ def evaluate_model(
         train_series: Training time series
         test_series: Test time series
         horizon: Forecast horizon
+        predictions: Forecast for the test period, if the caller already has
+            one; skips calling model.predict again
         
     Returns:
         Dictionary of evaluation metrics
     """
     try:
         # Make predictions
-        predictions = model.predict(len(test_series))
+        if predictions is None:
+            predictions = model.predict(len(test_series))
         
         # Calculate metrics
-        metrics = {
-            'mae': mae(test_series, predictions),
-            'mse': mse(test_series, predictions),
-            'rmse': rmse(test_series, predictions),
-            'mape': mape(test_series, predictions)
-        }
-        
-        return metrics
+        return compute_metrics(
+            test_series.values(copy=False), predictions.values(copy=False)
+        )
         
     except Exception as e:
         logger.error(f"Error evaluating model: {str(e)}")
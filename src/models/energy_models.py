@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, DateTime, String, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, Float, DateTime, String, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
@@ -33,9 +33,13 @@ class PowerPlant(Base):
 
 class EnergyConsumption(Base):
     __tablename__ = 'energy_consumption'
+    __table_args__ = (
+        Index('ix_ec_region_ts', 'region', 'timestamp'),
+        Index('ix_ec_ts_brin', 'timestamp', postgresql_using='brin'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    timestamp = Column(DateTime, index=True)
+    timestamp = Column(DateTime)
     region = Column(String, index=True)
     consumption_mwh = Column(Float)
     temperature = Column(Float, nullable=True)
@@ -48,12 +52,30 @@ class EnergyConsumption(Base):
 
 class Anomaly(Base):
     __tablename__ = 'anomalies'
+    __table_args__ = (
+        Index('ix_anom_region_ts', 'region', 'timestamp'),
+        Index('ix_anom_ts_brin', 'timestamp', postgresql_using='brin'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    timestamp = Column(DateTime, index=True)
+    timestamp = Column(DateTime)
     region = Column(String, index=True)
     actual_value = Column(Float)
     predicted_value = Column(Float)
     anomaly_score = Column(Float)
     is_confirmed = Column(Integer, default=0)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+class SyncCheckpoint(Base):
+    """Checksum of a (region, time bucket) of a table as last pushed to PowerBI"""
+    __tablename__ = 'sync_checkpoints'
+    __table_args__ = (
+        Index('ix_sync_checkpoints_key', 'table_name', 'bucket_start', 'region', unique=True),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    table_name = Column(String, nullable=False)
+    region = Column(String, nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+    row_hash = Column(String, nullable=False)
+    last_synced_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
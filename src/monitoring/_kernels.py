@@ -0,0 +1,41 @@
+"""Numba kernels for the metrics collector."""
+import numpy as np
+from numba import njit
+
+@njit(cache=True)
+def timer_summaries(values: np.ndarray, counts: np.ndarray):
+    """
+    Min, max and sum of the stored values of every timer in one pass.
+    
+    Only the first counts[i] entries of row i hold values; the ring order
+    does not matter for these aggregates.
+    
+    Args:
+        values: (timers, history) float32 matrix of recent timer values
+        counts: Number of stored values per timer
+    
+    Returns:
+        Tuple of (mins, maxs, sums) arrays, zero for timers without values
+    """
+    k = counts.shape[0]
+    mins = np.zeros(k, dtype=np.float32)
+    maxs = np.zeros(k, dtype=np.float32)
+    sums = np.zeros(k, dtype=np.float64)
+    for i in range(k):
+        n = counts[i]
+        if n == 0:
+            continue
+        lo = values[i, 0]
+        hi = values[i, 0]
+        total = 0.0
+        for j in range(n):
+            value = values[i, j]
+            if value < lo:
+                lo = value
+            if value > hi:
+                hi = value
+            total += value
+        mins[i] = lo
+        maxs[i] = hi
+        sums[i] = total
+    return mins, maxs, sums
@@ -3,15 +3,88 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from typing import Dict, Any, Optional
+import asyncio
 import psutil
 import time
 import os
 
-from ..config.database import get_db_session
+from ..config.database import engine, get_db_session
 from .metrics import metrics
 
 router = APIRouter(prefix="/health", tags=["health"])
 
+# Seconds a system resource sample is reused across probes
+SYSTEM_SAMPLE_TTL = 5.0
+
+_system_sample: Optional[Dict[str, float]] = None
+_system_sampled_at = 0.0
+
+# Seconds a readiness result is reused, and the bound on the DB check itself
+READINESS_CACHE_TTL = 1.0
+READINESS_TIMEOUT = 0.5
+
+_readiness_error: Optional[str] = None
+_readiness_checked_at: Optional[float] = None
+
+# Prime the CPU counter so non-blocking calls measure since import
+psutil.cpu_percent(interval=None)
+
+def _sample_system() -> Dict[str, float]:
+    """
+    Sample CPU, memory and disk usage, reusing a recent sample if available.
+    
+    Returns:
+        Dictionary with cpu, memory and disk usage percentages
+    """
+    global _system_sample, _system_sampled_at
+    
+    now = time.monotonic()
+    if _system_sample is None or now - _system_sampled_at > SYSTEM_SAMPLE_TTL:
+        _system_sample = {
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "memory_percent": psutil.virtual_memory().percent,
+            "disk_percent": psutil.disk_usage('/').percent
+        }
+        _system_sampled_at = now
+    
+    return _system_sample
+
+def _ping_db() -> None:
+    """Run a trivial query on a connection owned by the calling thread"""
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+async def _check_db_cached() -> Optional[str]:
+    """
+    Check database connectivity, reusing a recent result if available.
+    
+    The query runs on its own pooled connection rather than a request's
+    Session: on timeout the worker thread keeps running, and a Session must
+    not be used by it while the request closes it.
+    
+    Returns:
+        None if the database is reachable, otherwise the error message
+    """
+    global _readiness_error, _readiness_checked_at
+    
+    now = time.monotonic()
+    if _readiness_checked_at is not None and now - _readiness_checked_at <= READINESS_CACHE_TTL:
+        return _readiness_error
+    
+    try:
+        await asyncio.wait_for(
+            asyncio.to_thread(_ping_db),
+            timeout=READINESS_TIMEOUT
+        )
+        _readiness_error = None
+    except asyncio.TimeoutError:
+        _readiness_error = f"database check timed out after {READINESS_TIMEOUT}s"
+    except Exception as e:
+        _readiness_error = str(e)
+    
+    _readiness_checked_at = now
+    return _readiness_error
+
 @router.get("/")
 async def health_check() -> Dict[str, Any]:
     """
@@ -64,19 +137,15 @@ async def detailed_health_check(
     
     # System resources
     try:
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
+        sample = await asyncio.to_thread(_sample_system)
         
         health_status["checks"]["system"] = {
             "status": "healthy",
-            "cpu_percent": cpu_percent,
-            "memory_percent": memory.percent,
-            "disk_percent": disk.percent
+            **sample
         }
         
         # Alert if resources are too high
-        if cpu_percent > 90 or memory.percent > 90 or disk.percent > 90:
+        if max(sample.values()) > 90:
             health_status["checks"]["system"]["status"] = "degraded"
             health_status["status"] = "degraded"
             
@@ -100,24 +169,21 @@ async def get_metrics() -> Dict[str, Any]:
     return metrics.get_metrics()
 
 @router.get("/ready")
-async def readiness_check(
-    db: Session = Depends(get_db_session)
-) -> Dict[str, str]:
+async def readiness_check() -> Dict[str, str]:
     """
     Kubernetes readiness probe endpoint.
     
     Returns:
         Status indicating if the service is ready to receive traffic
     """
-    try:
-        # Check if database is ready
-        db.execute(text("SELECT 1"))
-        return {"status": "ready"}
-    except Exception as e:
+    # Check if database is ready
+    error = await _check_db_cached()
+    if error is not None:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Service not ready: {str(e)}"
+            detail=f"Service not ready: {error}"
         )
+    return {"status": "ready"}
 
 @router.get("/live")
 async def liveness_check() -> Dict[str, str]:
@@ -1,52 +1,333 @@
+import os
 import time
+import zlib
+import tempfile
 import logging
-from typing import Dict, Any, Optional
-from functools import wraps
-from datetime import datetime, timedelta
-from collections import defaultdict, deque
+from typing import Dict, Any, Optional, Tuple
+from functools import lru_cache, wraps
+from contextlib import contextmanager
+from datetime import datetime
+from collections import defaultdict
 import asyncio
+import threading
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from ._kernels import timer_summaries
 
 logger = logging.getLogger(__name__)
 
+# Recent requests kept for the response time and error rate
+REQUEST_HISTORY_SIZE = 1000
+
+# Width of the request rate window, in one-second buckets
+RATE_WINDOW_SECONDS = 60
+
+# Distinct counter keys the collector can hold; keys are method/status/path
+# combinations, so this is far above what the API produces
+MAX_COUNTERS = 4096
+
+# Bytes reserved for each counter key in a shared counter segment
+SHARED_KEY_BYTES = 256
+
+# Worker processes a shared counter segment has rows for
+MAX_SHARED_WORKERS = 64
+
+@lru_cache(maxsize=4096)
+def _compose_key(name: str, tag_items: Tuple[Tuple[str, str], ...]) -> str:
+    """Build a metric key from a name and sorted tag pairs"""
+    if not tag_items:
+        return name
+    
+    tag_str = ",".join(f"{k}={v}" for k, v in tag_items)
+    return f"{name}{{{tag_str}}}"
+
+# Recent values kept per timer
+TIMER_HISTORY_SIZE = 100
+
+# Distinct timer keys the collector can hold
+MAX_TIMERS = 1024
+
+class _SharedCounters:
+    """
+    Counters kept in a named shared memory segment.
+    
+    Each worker process attaching to the same name owns one row of counter
+    values and is its only writer, so increments need no cross-process
+    locking; reading sums the rows to give the totals over all workers. The
+    row is claimed on first use in each process, so workers forked from a
+    parent that created the collector (gunicorn --preload) get rows of
+    their own rather than sharing the parent's. Key
+    slots are found by open addressing from the key's CRC32, which is the
+    same in every process. A worker taking over the row of an exited one
+    keeps its counts, so totals never go backwards.
+    
+    The segment outlives the processes using it; use a fresh name per
+    deployment so counters start from zero.
+    """
+    
+    def __init__(self, name: str, size: int = MAX_COUNTERS, max_workers: int = MAX_SHARED_WORKERS):
+        import fcntl
+        self._fcntl = fcntl
+        
+        nbytes = max_workers * 8 + max_workers * size * 8 + size * SHARED_KEY_BYTES
+        try:
+            self._shm = SharedMemory(name=name, create=True, size=nbytes)
+        except FileExistsError:
+            self._shm = SharedMemory(name=name)
+        # Keep a worker's exit from unlinking the segment under the others
+        resource_tracker.unregister("/" + self._shm.name, "shared_memory")
+        
+        # flock locks are shared by forked processes through an inherited
+        # descriptor, so each process opens the lock file itself
+        self._lock_path = os.path.join(tempfile.gettempdir(), f"{self._shm.name}.lock")
+        self._lock_fd = None
+        self._lock_pid = None
+        self._row_pid = None
+        self._values = None
+        
+        buf = self._shm.buf
+        self.size = size
+        self._pids = np.ndarray(max_workers, dtype=np.int64, buffer=buf)
+        self._rows = np.ndarray(
+            (max_workers, size), dtype=np.uint64, buffer=buf, offset=max_workers * 8
+        )
+        self._keys = np.ndarray(
+            (size, SHARED_KEY_BYTES), dtype=np.uint8, buffer=buf,
+            offset=max_workers * 8 + max_workers * size * 8
+        )
+    
+    @property
+    def values(self) -> np.ndarray:
+        """This process's row of counter values, claimed on first use"""
+        pid = os.getpid()
+        if self._row_pid != pid:
+            self._values = self._rows[self._claim_row()]
+            self._row_pid = pid
+        return self._values
+    
+    @contextmanager
+    def _locked(self):
+        """Hold an exclusive lock on the segment while claiming rows or slots"""
+        pid = os.getpid()
+        if self._lock_pid != pid:
+            self._lock_fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+            self._lock_pid = pid
+        
+        self._fcntl.flock(self._lock_fd, self._fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            self._fcntl.flock(self._lock_fd, self._fcntl.LOCK_UN)
+    
+    def _claim_row(self) -> int:
+        """Take a free row, or the row of a worker that has exited"""
+        with self._locked():
+            for row, pid in enumerate(self._pids):
+                if pid and _pid_alive(int(pid)):
+                    continue
+                self._pids[row] = os.getpid()
+                return row
+        raise RuntimeError(f"No free metrics row in shared memory segment {self._shm.name}")
+    
+    def slot(self, key: str) -> Optional[int]:
+        """Find the slot for a key, claiming a free one if it has none"""
+        encoded = key.encode()
+        if len(encoded) > SHARED_KEY_BYTES:
+            return None
+        
+        start = zlib.crc32(encoded) % self.size
+        with self._locked():
+            for i in range(self.size):
+                slot = (start + i) % self.size
+                stored = self._keys[slot].tobytes().rstrip(b"\0")
+                if not stored:
+                    self._keys[slot, :len(encoded)] = np.frombuffer(encoded, dtype=np.uint8)
+                    return slot
+                if stored == encoded:
+                    return slot
+        return None
+    
+    def totals(self) -> Dict[str, int]:
+        """Counter totals over all workers, keyed by counter key"""
+        values = self._rows.sum(axis=0, dtype=np.uint64)
+        claimed = np.flatnonzero(self._keys[:, 0])
+        return {
+            self._keys[slot].tobytes().rstrip(b"\0").decode(): int(values[slot])
+            for slot in claimed
+        }
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process with the given pid is still running"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
 class MetricsCollector:
-    """Collect and store application metrics"""
+    """
+    Collect and store application metrics.
+    
+    Args:
+        shared_name: Name of a shared memory segment to keep the counters in,
+            so that all worker processes using the same name report the same
+            totals. Timers, gauges and request stats stay per process.
+    """
     
-    def __init__(self):
-        self.metrics = defaultdict(lambda: defaultdict(float))
-        self.counters = defaultdict(int)
-        self.timers = defaultdict(list)
-        self.recent_requests = deque(maxlen=1000)  # Keep last 1000 requests
+    def __init__(self, shared_name: Optional[str] = None):
+        self.gauges: Dict[str, float] = {}
+        self._counter_ids: Dict[str, int] = {}
+        self._shared = _SharedCounters(shared_name) if shared_name else None
+        self._counter_values = np.zeros(MAX_COUNTERS, dtype=np.uint64)
+        self._counter_lock = threading.Lock()
+        
+        # Ring of recent values per timer, one row per timer key
+        self._timer_ids: Dict[str, int] = {}
+        self._timer_values = np.zeros((MAX_TIMERS, TIMER_HISTORY_SIZE), dtype=np.float32)
+        self._timer_index = np.zeros(MAX_TIMERS, dtype=np.int64)
+        self._timer_counts = np.zeros(MAX_TIMERS, dtype=np.int64)
+        
+        # Ring of the last REQUEST_HISTORY_SIZE requests, one array per field
+        self._request_status = np.zeros(REQUEST_HISTORY_SIZE, dtype=np.int16)
+        self._request_durations = np.zeros(REQUEST_HISTORY_SIZE, dtype=np.float32)
+        self._request_head = 0
+        self._request_count = 0
+        
+        # Running aggregates over the request ring, kept in step with it
+        self._duration_sum = 0.0
+        self._error_count = 0
+        
+        # Ring of per-second request counts for the request rate
+        self._rate_buckets = [0] * RATE_WINDOW_SECONDS
+        self._rate_head_sec = int(time.monotonic())
+        
         self.error_counts = defaultdict(int)
         self.start_time = datetime.utcnow()
     
     def increment_counter(self, name: str, value: int = 1, tags: Optional[Dict[str, str]] = None):
         """Increment a counter metric"""
-        key = self._make_key(name, tags)
-        self.counters[key] += value
+        self.increment_counter_key(self._make_key(name, tags), value)
+    
+    def increment_counter_key(self, key: str, value: int = 1):
+        """Increment a counter by its precomputed key"""
+        key_id = self._counter_id(key)
+        if key_id is not None:
+            # Single in-place add on a fixed array slot; no dict insert or rehash
+            values = self._counter_values if self._shared is None else self._shared.values
+            values[key_id] += value
+    
+    def _counter_id(self, key: str) -> Optional[int]:
+        """Get the array slot for a counter key, assigning one on first use"""
+        key_id = self._counter_ids.get(key)
+        if key_id is not None:
+            return key_id
+        
+        with self._counter_lock:
+            key_id = self._counter_ids.get(key)
+            if key_id is None:
+                if self._shared is not None:
+                    key_id = self._shared.slot(key)
+                elif len(self._counter_ids) < MAX_COUNTERS:
+                    key_id = len(self._counter_ids)
+                if key_id is None:
+                    logger.warning(f"Counter capacity reached, dropping counter: {key}")
+                    return None
+                self._counter_ids[key] = key_id
+        return key_id
+    
+    @property
+    def counters(self) -> Dict[str, int]:
+        """Snapshot of all counters keyed by name and tags"""
+        if self._shared is not None:
+            # Includes counters only other workers have touched
+            return self._shared.totals()
+        
+        values = self._counter_values.copy()
+        return {key: int(values[key_id]) for key, key_id in list(self._counter_ids.items())}
     
     def record_timer(self, name: str, duration: float, tags: Optional[Dict[str, str]] = None):
         """Record a timing metric"""
-        key = self._make_key(name, tags)
-        self.timers[key].append(duration)
+        self.record_timer_key(self._make_key(name, tags), duration)
+    
+    def record_timer_key(self, key: str, duration: float):
+        """Record a timing metric by its precomputed key"""
+        timer_id = self._timer_id(key)
+        if timer_id is None:
+            return
+        
+        index = self._timer_index[timer_id]
+        self._timer_values[timer_id, index] = duration
+        self._timer_index[timer_id] = (index + 1) % TIMER_HISTORY_SIZE
+        if self._timer_counts[timer_id] < TIMER_HISTORY_SIZE:
+            self._timer_counts[timer_id] += 1
+    
+    def _timer_id(self, key: str) -> Optional[int]:
+        """Get the row for a timer key, assigning one on first use"""
+        timer_id = self._timer_ids.get(key)
+        if timer_id is not None:
+            return timer_id
         
-        # Keep only recent values (last 100)
-        if len(self.timers[key]) > 100:
-            self.timers[key] = self.timers[key][-100:]
+        with self._counter_lock:
+            timer_id = self._timer_ids.get(key)
+            if timer_id is None:
+                if len(self._timer_ids) >= MAX_TIMERS:
+                    logger.warning(f"Timer capacity reached, dropping timer: {key}")
+                    return None
+                timer_id = len(self._timer_ids)
+                self._timer_ids[key] = timer_id
+        return timer_id
+    
+    @property
+    def timers(self) -> Dict[str, Dict[str, float]]:
+        """Count, average, min and max of the recent values of every timer"""
+        timer_ids = dict(self._timer_ids)
+        k = len(timer_ids)
+        counts = self._timer_counts[:k].copy()
+        # Compiled on the first scrape; later processes load it from numba's cache
+        mins, maxs, sums = timer_summaries(self._timer_values[:k], counts)
+        
+        summaries = {}
+        for key, timer_id in timer_ids.items():
+            count = int(counts[timer_id])
+            summaries[key] = {
+                'count': count,
+                'avg': float(sums[timer_id] / count) if count else 0,
+                'min': float(mins[timer_id]),
+                'max': float(maxs[timer_id])
+            }
+        return summaries
     
     def record_gauge(self, name: str, value: float, tags: Optional[Dict[str, str]] = None):
         """Record a gauge metric"""
-        key = self._make_key(name, tags)
-        self.metrics[name][key] = value
+        self.gauges[self._make_key(name, tags)] = value
     
     def record_request(self, method: str, path: str, status_code: int, duration: float):
         """Record HTTP request metrics"""
-        self.recent_requests.append({
-            'timestamp': datetime.utcnow(),
-            'method': method,
-            'path': path,
-            'status_code': status_code,
-            'duration': duration
-        })
+        head = self._request_head
+        if self._request_count == REQUEST_HISTORY_SIZE:
+            # The slot about to be overwritten holds the oldest request
+            self._duration_sum -= float(self._request_durations[head])
+            if self._request_status[head] >= 400:
+                self._error_count -= 1
+        else:
+            self._request_count += 1
+        
+        self._request_status[head] = status_code
+        self._request_durations[head] = duration
+        self._request_head = (head + 1) % REQUEST_HISTORY_SIZE
+        
+        # Add the stored value so evictions subtract exactly what was added
+        self._duration_sum += float(self._request_durations[head])
+        if status_code >= 400:
+            self._error_count += 1
+        
+        self._advance_rate_window(int(time.monotonic()))
+        self._rate_buckets[self._rate_head_sec % RATE_WINDOW_SECONDS] += 1
         
         # Increment counters
         self.increment_counter('http_requests_total', tags={
@@ -67,32 +348,38 @@ class MetricsCollector:
                 'status': str(status_code)
             })
     
+    def _advance_rate_window(self, now_sec: int):
+        """Move the rate ring forward to now_sec, clearing the seconds skipped"""
+        elapsed = now_sec - self._rate_head_sec
+        if elapsed <= 0:
+            return
+        
+        for sec in range(self._rate_head_sec + 1, self._rate_head_sec + min(elapsed, RATE_WINDOW_SECONDS) + 1):
+            self._rate_buckets[sec % RATE_WINDOW_SECONDS] = 0
+        self._rate_head_sec = now_sec
+    
     def _make_key(self, name: str, tags: Optional[Dict[str, str]] = None) -> str:
         """Create a key from name and tags"""
         if not tags:
             return name
         
-        tag_str = ",".join(f"{k}={v}" for k, v in sorted(tags.items()))
-        return f"{name}{{tags}}"
+        return _compose_key(name, tuple(sorted(tags.items())))
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get all collected metrics"""
         
-        # Calculate request rate (requests per minute)
         now = datetime.utcnow()
-        recent_minute = [r for r in self.recent_requests 
-                        if now - r['timestamp'] < timedelta(minutes=1)]
-        request_rate = len(recent_minute)
+        total_requests = self._request_count
+        
+        # Calculate request rate (requests per minute)
+        self._advance_rate_window(int(time.monotonic()))
+        request_rate = sum(self._rate_buckets)
         
         # Calculate average response time
-        if self.recent_requests:
-            avg_response_time = sum(r['duration'] for r in self.recent_requests) / len(self.recent_requests)
-        else:
-            avg_response_time = 0
+        avg_response_time = self._duration_sum / total_requests if total_requests else 0
         
         # Calculate error rate
-        error_requests = [r for r in self.recent_requests if r['status_code'] >= 400]
-        error_rate = len(error_requests) / max(len(self.recent_requests), 1) * 100
+        error_rate = self._error_count / max(total_requests, 1) * 100
         
         # Uptime
         uptime = (now - self.start_time).total_seconds()
@@ -102,42 +389,40 @@ class MetricsCollector:
             'request_rate_per_minute': request_rate,
             'avg_response_time_ms': avg_response_time * 1000,
             'error_rate_percent': error_rate,
-            'total_requests': len(self.recent_requests),
-            'counters': dict(self.counters),
-            'timers': {k: {
-                'count': len(v),
-                'avg': sum(v) / len(v) if v else 0,
-                'min': min(v) if v else 0,
-                'max': max(v) if v else 0
-            } for k, v in self.timers.items()},
-            'gauges': dict(self.metrics)
+            'total_requests': total_requests,
+            'counters': self.counters,
+            'timers': self.timers,
+            'gauges': dict(self.gauges)
         }
 
-# Global metrics collector
-metrics = MetricsCollector()
+# Global metrics collector; set METRICS_SHARED_MEMORY to a segment name to
+# aggregate counters across worker processes
+metrics = MetricsCollector(shared_name=os.getenv("METRICS_SHARED_MEMORY"))
 
 def track_time(metric_name: str, tags: Optional[Dict[str, str]] = None):
     """Decorator to track execution time of functions"""
     def decorator(func):
+        key = metrics._make_key(metric_name, tags)
+        
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             try:
                 result = await func(*args, **kwargs)
                 return result
             finally:
-                duration = time.time() - start_time
-                metrics.record_timer(metric_name, duration, tags)
+                duration = (time.perf_counter_ns() - start_ns) * 1e-9
+                metrics.record_timer_key(key, duration)
         
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             try:
                 result = func(*args, **kwargs)
                 return result
             finally:
-                duration = time.time() - start_time
-                metrics.record_timer(metric_name, duration, tags)
+                duration = (time.perf_counter_ns() - start_ns) * 1e-9
+                metrics.record_timer_key(key, duration)
         
         return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
     return decorator
@@ -145,9 +430,11 @@ def track_time(metric_name: str, tags: Optional[Dict[str, str]] = None):
 def count_calls(metric_name: str, tags: Optional[Dict[str, str]] = None):
     """Decorator to count function calls"""
     def decorator(func):
+        key = metrics._make_key(metric_name, tags)
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            metrics.increment_counter(metric_name, tags=tags)
+            metrics.increment_counter_key(key)
             return func(*args, **kwargs)
         return wrapper
     return decorator
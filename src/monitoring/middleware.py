@@ -1,12 +1,25 @@
 """FastAPI middleware for monitoring and metrics collection."""
 import time
-from typing import Callable, Awaitable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from typing import Iterable, Optional
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from .metrics import metrics
 
-class MonitoringMiddleware(BaseHTTPMiddleware):
+# Metric path for requests that matched no route (404s)
+UNMATCHED_PATH = "__nomatch__"
+
+# Probe and scrape paths passed through without being recorded
+DEFAULT_EXCLUDED_PATHS = frozenset({
+    "/health",
+    "/health/",
+    "/health/live",
+    "/health/ready",
+    "/health/metrics",
+    "/favicon.ico",
+})
+
+class MonitoringMiddleware:
     """
     Middleware to collect HTTP request metrics.
     
@@ -15,36 +28,71 @@ class MonitoringMiddleware(BaseHTTPMiddleware):
     - Request duration
     - Error rates
     - Response times
+    
+    Implemented as a plain ASGI middleware rather than on BaseHTTPMiddleware,
+    which runs every request through an extra task group and response stream.
     """
     
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        start_time = time.time()
+    def __init__(self, app: ASGIApp, exclude_paths: Optional[Iterable[str]] = None):
+        """
+        Args:
+            app: ASGI application to wrap
+            exclude_paths: Request paths to pass through without recording;
+                defaults to the health probe and metrics endpoints
+        """
+        self.app = app
+        self.exclude_paths = (
+            DEFAULT_EXCLUDED_PATHS if exclude_paths is None else frozenset(exclude_paths)
+        )
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        
+        start_ns = time.perf_counter_ns()
+        status_code = 500  # Internal Server Error unless a response is started
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                
+                # Add server timing header
+                headers = MutableHeaders(scope=message)
+                headers["X-Process-Time"] = f"{(time.perf_counter_ns() - start_ns) / 1e9:.6f}"
+            await send(message)
         
         try:
             # Process the request
-            response = await call_next(request)
-            duration = time.time() - start_time
-            
-            # Record successful request
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Record the request, failed or not
             metrics.record_request(
-                method=request.method,
-                path=request.url.path,
-                status_code=response.status_code,
-                duration=duration
+                method=scope["method"],
+                path=self._route_path(scope, status_code),
+                status_code=status_code,
+                duration=(time.perf_counter_ns() - start_ns) * 1e-9
             )
+    
+    @staticmethod
+    def _route_path(scope: Scope, status_code: int) -> str:
+        """
+        Get the path to record a request under.
+        
+        Uses the matched route's template (e.g. ``/plants/{plant_id}``) so that
+        parameterised endpoints share one metric key instead of one per URL.
+        
+        Args:
+            scope: ASGI scope after routing
+            status_code: Response status code
             
-            # Add server timing header
-            response.headers["X-Process-Time"] = str(duration)
-            
-            return response
-            
-        except Exception as e:
-            # Record failed request
-            duration = time.time() - start_time
-            metrics.record_request(
-                method=request.method,
-                path=request.url.path,
-                status_code=500,  # Internal Server Error
-                duration=duration
-            )
-            raise
+        Returns:
+            Route template, or a fixed key for unmatched requests
+        """
+        route = scope.get("route")
+        if route is not None:
+            return route.path
+        if status_code == 404:
+            return UNMATCHED_PATH
+        return scope["path"]
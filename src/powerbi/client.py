@@ -1,6 +1,11 @@
 import os
+import gzip
+import time
+import threading
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 import pandas as pd
@@ -11,6 +16,34 @@ import msal
 
 logger = logging.getLogger(__name__)
 
+# PowerBI push dataset limits for a single POST rows request
+MAX_ROWS_PER_REQUEST = 10000
+MAX_PAYLOAD_BYTES = 15 * 1024 * 1024
+
+# Row payloads from this size up are sent gzip-compressed; below it the
+# compression saves less than it costs
+GZIP_MIN_BYTES = 1024
+GZIP_COMPRESSLEVEL = 6
+
+# Seconds before the reported token expiry at which it is refreshed
+TOKEN_REFRESH_MARGIN = 300
+
+# Export status polling backoff bounds, in seconds
+EXPORT_POLL_INITIAL_DELAY = 0.25
+EXPORT_POLL_MAX_DELAY = 5.0
+
+# Pooled connections kept for API calls issued concurrently (e.g. parallel syncs)
+MAX_CONCURRENT_REQUESTS = 8
+
+# Retries of failed connections and throttled or unavailable responses;
+# responses are only retried for idempotent methods, so rows are never pushed twice
+HTTP_RETRIES = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 502, 503, 504),
+    raise_on_status=False
+)
+
 class DatasetRefreshStatus(Enum):
     """Enum for dataset refresh status"""
     UNKNOWN = "Unknown"
@@ -29,6 +62,8 @@ class PowerBIConfig:
     password: Optional[str] = None
     authority: str = "https://login.microsoftonline.com"
     scope: List[str] = None
+    token_cache_path: Optional[str] = None
+    metadata_cache_path: Optional[str] = None
     
     def __post_init__(self):
         if self.scope is None:
@@ -60,7 +95,21 @@ class PowerBIClient:
         self.base_url = "https://api.powerbi.com/v1.0/myorg"
         self.token = None
         self.token_expires = None
+        self._app = None
+        self._token_cache = msal.SerializableTokenCache()
+        self._auth_lock = threading.RLock()
+        
+        # Reuse tokens persisted by a previous process
+        if config.token_cache_path and os.path.exists(config.token_cache_path):
+            with open(config.token_cache_path, "r") as f:
+                self._token_cache.deserialize(f.read())
+        
+        # One keep-alive session for all calls, so TLS connections are reused
         self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(
+            pool_maxsize=MAX_CONCURRENT_REQUESTS,
+            max_retries=HTTP_RETRIES
+        ))
         
     def authenticate(self) -> bool:
         """
@@ -69,62 +118,86 @@ class PowerBIClient:
         Returns:
             bool: True if authentication successful
         """
-        try:
-            authority_url = f"{self.config.authority}/{self.config.tenant_id}"
-            
-            # Initialize MSAL app
-            app = msal.ConfidentialClientApplication(
-                client_id=self.config.client_id,
-                client_credential=self.config.client_secret,
-                authority=authority_url
-            )
-            
-            # Try to get token from cache first
-            accounts = app.get_accounts()
-            if accounts:
-                result = app.acquire_token_silent(
-                    scopes=self.config.scope,
-                    account=accounts[0]
-                )
-            else:
-                result = None
-            
-            # If no cached token, acquire new token
-            if not result:
-                if self.config.username and self.config.password:
-                    # Username/password flow (for service accounts)
-                    result = app.acquire_token_by_username_password(
-                        username=self.config.username,
-                        password=self.config.password,
-                        scopes=self.config.scope
+        # Sync threads share one client; a single thread refreshes the token
+        # and writes the cache at a time
+        with self._auth_lock:
+            try:
+                # Initialize MSAL app once, so its token cache lives as long as the client
+                if self._app is None:
+                    authority_url = f"{self.config.authority}/{self.config.tenant_id}"
+                    self._app = msal.ConfidentialClientApplication(
+                        client_id=self.config.client_id,
+                        client_credential=self.config.client_secret,
+                        authority=authority_url,
+                        token_cache=self._token_cache
                     )
-                else:
-                    # Client credentials flow (for app-only access)
-                    result = app.acquire_token_for_client(
-                        scopes=self.config.scope
+                app = self._app
+                
+                # Try to get token from cache first
+                accounts = app.get_accounts()
+                if accounts:
+                    result = app.acquire_token_silent(
+                        scopes=self.config.scope,
+                        account=accounts[0]
                     )
-            
-            if "access_token" in result:
-                self.token = result["access_token"]
-                # Calculate token expiry (usually 1 hour)
-                expires_in = result.get("expires_in", 3600)
-                self.token_expires = datetime.now() + timedelta(seconds=expires_in)
+                else:
+                    result = None
                 
-                # Update session headers
-                self._session.headers.update({
-                    "Authorization": f"Bearer {self.token}",
-                    "Content-Type": "application/json"
-                })
+                # If no cached token, acquire new token
+                if not result:
+                    if self.config.username and self.config.password:
+                        # Username/password flow (for service accounts)
+                        result = app.acquire_token_by_username_password(
+                            username=self.config.username,
+                            password=self.config.password,
+                            scopes=self.config.scope
+                        )
+                    else:
+                        # Client credentials flow (for app-only access)
+                        result = app.acquire_token_for_client(
+                            scopes=self.config.scope
+                        )
                 
-                logger.info("PowerBI authentication successful")
-                return True
-            else:
-                logger.error(f"PowerBI authentication failed: {result.get('error_description', 'Unknown error')}")
+                if "access_token" in result:
+                    self.token = result["access_token"]
+                    # Calculate token expiry (usually 1 hour)
+                    expires_in = result.get("expires_in", 3600)
+                    self.token_expires = datetime.now() + timedelta(seconds=expires_in)
+                    
+                    self._save_token_cache()
+                    
+                    # Update session headers
+                    self._session.headers.update({
+                        "Authorization": f"Bearer {self.token}",
+                        "Content-Type": "application/json"
+                    })
+                    
+                    logger.info("PowerBI authentication successful")
+                    return True
+                else:
+                    logger.error(f"PowerBI authentication failed: {result.get('error_description', 'Unknown error')}")
+                    return False
+                    
+            except Exception as e:
+                logger.error(f"PowerBI authentication error: {str(e)}")
                 return False
-                
-        except Exception as e:
-            logger.error(f"PowerBI authentication error: {str(e)}")
-            return False
+        
+    def _save_token_cache(self) -> None:
+        """Persist the MSAL token cache if it changed and a path is configured"""
+        if not self.config.token_cache_path or not self._token_cache.has_state_changed:
+            return
+        
+        try:
+            # The cache holds bearer tokens, so keep it readable by the owner
+            # only; it is swapped in whole so readers never see a partial file
+            path = self.config.token_cache_path
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                f.write(self._token_cache.serialize())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not persist PowerBI token cache: {str(e)}")
     
     def _ensure_authenticated(self) -> bool:
         """
@@ -133,11 +206,23 @@ class PowerBIClient:
         Returns:
             bool: True if authenticated
         """
-        if not self.token or (self.token_expires and datetime.now() >= self.token_expires):
-            return self.authenticate()
-        return True
+        if not self._token_stale():
+            return True
+        
+        with self._auth_lock:
+            # Another thread may have refreshed the token while this one waited
+            if self._token_stale():
+                return self.authenticate()
+            return True
     
-    def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None) -> requests.Response:
+    def _token_stale(self) -> bool:
+        """Check whether the token is missing or due for refresh"""
+        # Refresh ahead of expiry so requests never go out with a stale token
+        refresh_at = self.token_expires - timedelta(seconds=TOKEN_REFRESH_MARGIN) if self.token_expires else None
+        return not self.token or bool(refresh_at and datetime.now() >= refresh_at)
+    
+    def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None,
+                      content: Optional[bytes] = None, headers: Optional[Dict[str, str]] = None) -> requests.Response:
         """
         Make authenticated request to PowerBI API
         
@@ -146,6 +231,8 @@ class PowerBIClient:
             endpoint: API endpoint
             data: Request data
             params: URL parameters
+            content: Pre-serialized JSON body, used instead of serializing data
+            headers: Extra request headers
             
         Returns:
             Response object
@@ -155,23 +242,30 @@ class PowerBIClient:
         
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         
+        # Serialize with orjson; the session already sends a JSON Content-Type
+        if content is None and data is not None:
+            content = orjson.dumps(data, option=orjson.OPT_NAIVE_UTC)
+        
         try:
             response = self._session.request(
                 method=method,
                 url=url,
-                json=data,
+                data=content,
                 params=params,
+                headers=headers,
                 timeout=30
             )
             
             if response.status_code == 401:
-                # Token might be expired, try to re-authenticate
+                # Tokens are refreshed before expiry, so this means it was revoked
+                logger.warning("PowerBI rejected the access token, re-authenticating")
                 if self.authenticate():
                     response = self._session.request(
                         method=method,
                         url=url,
-                        json=data,
+                        data=content,
                         params=params,
+                        headers=headers,
                         timeout=30
                     )
             
@@ -317,10 +411,42 @@ class PowerBIClient:
             endpoint = f"/groups/{workspace_id}/datasets/{dataset_id}/refreshes"
         else:
             endpoint = f"/datasets/{dataset_id}/refreshes"
+        
+        data = {"notifyOption": notify_option}
+        self._make_request("POST", endpoint, data=data)
+        return True
+    
+    def get_refresh_history(self, dataset_id: str, workspace_id: Optional[str] = None, top: int = 10) -> List[Dict]:
+        """
+        Get dataset refresh history, most recent first
+        
+        Args:
+            dataset_id: Dataset ID
+            workspace_id: Workspace ID
+            top: Maximum number of refreshes to return
+            
+        Returns:
+            List of refresh dictionaries
+        """
+        if workspace_id:
+            endpoint = f"/groups/{workspace_id}/datasets/{dataset_id}/refreshes"
+        else:
+            endpoint = f"/datasets/{dataset_id}/refreshes"
+        
+        response = self._make_request("GET", endpoint, params={"$top": top})
+        return response.json().get("value", [])
+    
+    def push_data_to_dataset(self, dataset_id: str, table_name: str, data: List[Any], workspace_id: Optional[str] = None) -> bool:
+        """
+        Push rows to a dataset table
+        
+        Rows are sent in batches that stay within PowerBI's per-request row
+        and payload size limits.
+        
         Args:
             dataset_id: Dataset ID
             table_name: Table name
-            data: List of row dictionaries
+            data: List of row dictionaries or dataclass instances
             workspace_id: Workspace ID
             
         Returns:
@@ -331,11 +457,35 @@ class PowerBIClient:
         else:
             endpoint = f"/datasets/{dataset_id}/tables/{table_name}/rows"
         
-        # PowerBI expects data in "rows" format
-        payload = {"rows": data}
-        self._make_request("POST", endpoint, data=payload)
+        for start in range(0, len(data), MAX_ROWS_PER_REQUEST):
+            self._post_rows(endpoint, data[start:start + MAX_ROWS_PER_REQUEST])
         return True
     
+    def _post_rows(self, endpoint: str, rows: List[Any]) -> None:
+        """
+        POST one batch of rows, halving it while the payload is too large
+        
+        Args:
+            endpoint: Table rows endpoint
+            rows: Row dictionaries or dataclass instances for this batch
+        """
+        # PowerBI expects data in "rows" format; naive datetimes are UTC
+        body = orjson.dumps({"rows": rows}, option=orjson.OPT_NAIVE_UTC)
+        
+        if len(body) > MAX_PAYLOAD_BYTES and len(rows) > 1:
+            middle = len(rows) // 2
+            self._post_rows(endpoint, rows[:middle])
+            self._post_rows(endpoint, rows[middle:])
+            return
+        
+        # Rows repeat the same keys, so the JSON compresses very well
+        headers = None
+        if len(body) >= GZIP_MIN_BYTES:
+            body = gzip.compress(body, compresslevel=GZIP_COMPRESSLEVEL)
+            headers = {"Content-Encoding": "gzip"}
+        
+        self._make_request("POST", endpoint, content=body, headers=headers)
+    
     def clear_dataset_table(self, dataset_id: str, table_name: str, workspace_id: Optional[str] = None) -> bool:
         """
         Clear all rows from a dataset table
@@ -445,7 +595,8 @@ class PowerBIClient:
         response = self._make_request("POST", endpoint, data=data)
         export_id = response.json()["id"]
         
-        # Poll for completion
+        # Poll for completion, backing off from a short first wait
+        delay = EXPORT_POLL_INITIAL_DELAY
         while True:
             if workspace_id:
                 status_endpoint = f"/groups/{workspace_id}/reports/{report_id}/exports/{export_id}"
@@ -462,9 +613,14 @@ class PowerBIClient:
             elif status_data["status"] == "Failed":
                 raise Exception(f"Export failed: {status_data.get('error', 'Unknown error')}")
             
-            # Wait before polling again
-            import time
-            time.sleep(5)
+            # Wait before polling again, as long as the API asks if it says
+            retry_after = status_response.headers.get("Retry-After")
+            try:
+                wait = float(retry_after) if retry_after else delay
+            except ValueError:
+                wait = delay
+            time.sleep(wait)
+            delay = min(delay * 2, EXPORT_POLL_MAX_DELAY)
 
 def create_energy_dataset_schema(dataset_name: str) -> Dict:
     """
@@ -1,15 +1,242 @@
+import os
+import copy
 import logging
-from typing import Dict, List, Optional, Any
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session
+import numpy as np
 import pandas as pd
+import orjson
+import requests
 
 from .client import PowerBIClient, PowerBIConfig, create_energy_dataset_schema
-from ..models.energy_models import EnergyConsumption, Anomaly, PowerPlant
+from ..models.energy_models import EnergyConsumption, Anomaly, PowerPlant, SyncCheckpoint
 from ..config.database import get_db_session
 
 logger = logging.getLogger(__name__)
 
+# Rows read from the database and pushed to PowerBI per chunk
+SYNC_CHUNK_SIZE = 10000
+
+# Table syncs run concurrently by sync_all_data
+SYNC_WORKERS = 3
+
+# PowerBI calls run in the background while a sync reads the database: one
+# push and one table clear per concurrently running sync
+_background = ThreadPoolExecutor(max_workers=2 * SYNC_WORKERS, thread_name_prefix="powerbi-sync")
+
+# Width of the time buckets incremental syncs compare checksums over
+CHECKPOINT_FREQ = "H"
+
+# Resolved (workspace ID, dataset ID) by "tenant|workspace|dataset", shared by
+# all service instances; loaded from the configured cache file on first use
+_resolved_ids: Dict[str, Tuple[str, str]] = {}
+_resolved_ids_loaded = False
+_resolved_ids_lock = threading.Lock()
+
+# Season by month number; index 0 is unused
+_SEASON_BY_MONTH = (
+    None,
+    "Winter", "Winter",
+    "Spring", "Spring", "Spring",
+    "Summer", "Summer", "Summer",
+    "Autumn", "Autumn", "Autumn",
+    "Winter"
+)
+_SEASON_LOOKUP = np.array(_SEASON_BY_MONTH, dtype=object)
+
+def _as_datetimes(timestamps: pd.Series) -> pd.Series:
+    """
+    Convert a datetime64 column to datetime objects
+    
+    The client serializes datetime objects itself when encoding the payload,
+    so rows carry them as-is instead of being formatted one by one here.
+    
+    Args:
+        timestamps: datetime64 Series
+        
+    Returns:
+        Object Series of datetime.datetime values
+    """
+    return pd.Series(timestamps.dt.to_pydatetime(), index=timestamps.index, dtype=object)
+
+# Rows are built as slotted dataclasses rather than dicts: the schema is
+# fixed, a slotted instance is a fraction of a dict's size, and orjson
+# serializes dataclasses natively
+
+@dataclass
+class EnergyConsumptionRow:
+    """Row of the PowerBI EnergyConsumption table"""
+    __slots__ = (
+        "Timestamp", "Region", "ConsumptionMWh", "Temperature", "IsHoliday",
+        "HourOfDay", "DayOfWeek", "Month", "Year", "Season"
+    )
+    Timestamp: datetime
+    Region: str
+    ConsumptionMWh: float
+    Temperature: float
+    IsHoliday: bool
+    HourOfDay: int
+    DayOfWeek: int
+    Month: int
+    Year: int
+    Season: str
+
+@dataclass
+class AnomalyRow:
+    """Row of the PowerBI Anomalies table"""
+    __slots__ = (
+        "Timestamp", "Region", "ActualValue", "PredictedValue", "AnomalyScore",
+        "IsConfirmed", "DetectionMethod"
+    )
+    Timestamp: datetime
+    Region: str
+    ActualValue: float
+    PredictedValue: float
+    AnomalyScore: float
+    IsConfirmed: bool
+    DetectionMethod: str
+
+@dataclass
+class PowerPlantRow:
+    """Row of the PowerBI PowerPlants table"""
+    __slots__ = (
+        "Id", "Name", "Region", "CapacityMW", "FuelType", "CommissioningYear",
+        "Latitude", "Longitude"
+    )
+    Id: int
+    Name: str
+    Region: str
+    CapacityMW: float
+    FuelType: str
+    CommissioningYear: int
+    Latitude: float
+    Longitude: float
+
+def _to_rows(frame: pd.DataFrame, row_type: type) -> List[Any]:
+    """
+    Convert a DataFrame to PowerBI row objects
+    
+    Each column goes through numpy's tolist, which converts to Python values
+    in C, instead of DataFrame.to_dict boxing every value separately.
+    
+    Args:
+        frame: DataFrame with a column per field of row_type
+        row_type: Row dataclass of the target table
+        
+    Returns:
+        List of row_type instances
+    """
+    values = [frame[field.name].to_numpy().tolist() for field in fields(row_type)]
+    return [row_type(*row) for row in zip(*values)]
+
+def _energy_consumption_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a chunk of energy consumption records to PowerBI rows
+    
+    Args:
+        df: Chunk of the energy_consumption table
+        
+    Returns:
+        DataFrame with the EnergyConsumption table's columns
+    """
+    timestamps = df["timestamp"].dt
+    month = timestamps.month
+    return pd.DataFrame({
+        "Timestamp": _as_datetimes(df["timestamp"]),
+        "Region": df["region"].fillna("Unknown"),
+        "ConsumptionMWh": df["consumption_mwh"].fillna(0).astype(float),
+        "Temperature": df["temperature"].fillna(0).astype(float),
+        "IsHoliday": df["is_holiday"].fillna(False).astype(bool),
+        "HourOfDay": timestamps.hour,
+        "DayOfWeek": timestamps.weekday,
+        "Month": month,
+        "Year": timestamps.year,
+        "Season": _SEASON_LOOKUP[month.to_numpy()]
+    })
+
+def _anomaly_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a chunk of anomaly records to PowerBI rows
+    
+    Args:
+        df: Chunk of the anomalies table
+        
+    Returns:
+        DataFrame with the Anomalies table's columns
+    """
+    return pd.DataFrame({
+        "Timestamp": _as_datetimes(df["timestamp"]),
+        "Region": df["region"].fillna("Unknown"),
+        "ActualValue": df["actual_value"].fillna(0).astype(float),
+        "PredictedValue": df["predicted_value"].fillna(0).astype(float),
+        "AnomalyScore": df["anomaly_score"].fillna(0).astype(float),
+        "IsConfirmed": df["is_confirmed"].fillna(0).astype(bool),
+        "DetectionMethod": "IsolationForest"  # Default method
+    })
+
+def _power_plant_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert power plant records to PowerBI rows
+    
+    Args:
+        df: Rows of the power_plants table
+        
+    Returns:
+        DataFrame with the PowerPlants table's columns
+    """
+    return pd.DataFrame({
+        "Id": df["id"],
+        "Name": df["name"].fillna("Unknown"),
+        "Region": df["region"].fillna("Unknown"),
+        "CapacityMW": df["capacity_mw"].fillna(0).astype(float),
+        "FuelType": df["fuel_type"].fillna("Unknown"),
+        "CommissioningYear": 2020,  # Default value
+        "Latitude": 0.0,  # Would need to add these fields to model
+        "Longitude": 0.0
+    })
+
+def _whole_buckets(chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """
+    Regroup timestamp-ordered chunks so no checkpoint bucket spans two of them
+    
+    Args:
+        chunks: DataFrame chunks ordered by timestamp
+        
+    Yields:
+        DataFrames holding only complete buckets
+    """
+    carry = None
+    for chunk in chunks:
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        
+        # The last bucket may continue in the next chunk
+        last_bucket = chunk["timestamp"].iloc[-1].floor(CHECKPOINT_FREQ)
+        in_last = (chunk["timestamp"] >= last_bucket).to_numpy()
+        carry = chunk[in_last]
+        if not in_last.all():
+            yield chunk[~in_last]
+    
+    if carry is not None:
+        yield carry
+
+def _naive_utc(value: datetime) -> pd.Timestamp:
+    """
+    Convert a sync range bound to a naive timestamp comparable with the stored ones
+    
+    Args:
+        value: Naive or timezone-aware datetime
+        
+    Returns:
+        Naive Timestamp, in UTC if the value was aware
+    """
+    value = pd.Timestamp(value)
+    return value.tz_convert(None) if value.tzinfo is not None else value
+
 class PowerBIService:
     """
     Service class for managing PowerBI integration with energy analytics platform
@@ -43,6 +270,12 @@ class PowerBIService:
                 logger.error("Failed to authenticate with PowerBI")
                 return False
             
+            # Skip the workspace and dataset listing when resolved before
+            cached = self._cached_ids()
+            if cached:
+                self.workspace_id, self.dataset_id = cached
+                return True
+            
             # Get or create workspace
             workspace = self.client.get_workspace_by_name(self.workspace_name)
             if not workspace:
@@ -65,12 +298,281 @@ class PowerBIService:
                 self.dataset_id = existing_dataset["id"]
                 logger.info(f"Using existing PowerBI dataset: {self.dataset_name} (ID: {self.dataset_id})")
             
+            self._cache_ids()
             return True
             
         except Exception as e:
             logger.error(f"Failed to initialize PowerBI workspace: {str(e)}")
             return False
     
+    def _ids_key(self) -> str:
+        """Key of this service's workspace and dataset in the ID cache"""
+        return f"{self.client.config.tenant_id}|{self.workspace_name}|{self.dataset_name}"
+    
+    def _cached_ids(self) -> Optional[Tuple[str, str]]:
+        """
+        Look up previously resolved workspace and dataset IDs
+        
+        Returns:
+            Optional[Tuple]: (workspace ID, dataset ID), or None if not cached
+        """
+        global _resolved_ids_loaded
+        
+        with _resolved_ids_lock:
+            path = self.client.config.metadata_cache_path
+            if not _resolved_ids_loaded and path and os.path.exists(path):
+                try:
+                    with open(path, "rb") as f:
+                        _resolved_ids.update({key: tuple(ids) for key, ids in orjson.loads(f.read()).items()})
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Could not read PowerBI metadata cache: {str(e)}")
+            _resolved_ids_loaded = True
+            
+            return _resolved_ids.get(self._ids_key())
+    
+    def _cache_ids(self) -> None:
+        """Remember the resolved workspace and dataset IDs"""
+        with _resolved_ids_lock:
+            _resolved_ids[self._ids_key()] = (self.workspace_id, self.dataset_id)
+            self._save_cached_ids()
+    
+    def _forget_ids_if_missing(self, error: Exception) -> None:
+        """
+        Drop the cached IDs when PowerBI reports the workspace or dataset gone
+        
+        Args:
+            error: Error raised by a PowerBI call
+        """
+        response = getattr(error, "response", None)
+        if not isinstance(error, requests.HTTPError) or response is None or response.status_code != 404:
+            return
+        
+        with _resolved_ids_lock:
+            _resolved_ids.pop(self._ids_key(), None)
+            self._save_cached_ids()
+        self.workspace_id = None
+        self.dataset_id = None
+    
+    def _save_cached_ids(self) -> None:
+        """Write the ID cache to the configured file; callers hold the lock"""
+        path = self.client.config.metadata_cache_path
+        if not path:
+            return
+        
+        try:
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps(_resolved_ids))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not persist PowerBI metadata cache: {str(e)}")
+    
+    def _read_chunks(self, query: Query, model) -> Iterator[pd.DataFrame]:
+        """
+        Stream a query's rows in chunks ordered by (timestamp, id)
+        
+        The rows come from a single query through a server-side cursor, so
+        the table is scanned once and only one chunk is held client-side,
+        instead of issuing a new query per chunk.
+        
+        Args:
+            query: Query on a model with timestamp and id columns
+            model: The queried model class
+            
+        Yields:
+            DataFrame chunks of at most SYNC_CHUNK_SIZE rows
+        """
+        query = query.filter(model.timestamp.isnot(None)).order_by(model.timestamp, model.id)
+        
+        for chunk in pd.read_sql_query(
+            query.statement.execution_options(stream_results=True),
+            self.db.connection(),
+            parse_dates=["timestamp"],
+            chunksize=SYNC_CHUNK_SIZE
+        ):
+            if not chunk.empty:
+                yield chunk
+    
+    def _read_changed_rows(self, table_name: str, query: Query, model, to_frame,
+                           row_type: type, start_date: Optional[datetime] = None,
+                           end_date: Optional[datetime] = None) -> Iterator[List[Any]]:
+        """
+        Read a query's rows as PowerBI rows, skipping unchanged buckets
+        
+        Only buckets lying entirely inside [start_date, end_date] are compared
+        with and recorded as checkpoints. The rows of the partial buckets at
+        the range's edges are always pushed, and leave the checkpoints alone,
+        since a checksum over part of a bucket would not match the whole one.
+        
+        Args:
+            table_name: Dataset table the rows are pushed to
+            query: Query on a model with timestamp and id columns
+            model: The queried model class
+            to_frame: Converts a chunk of records to the table's columns
+            row_type: Row dataclass of the table
+            start_date: Inclusive lower timestamp bound of the query, if any
+            end_date: Inclusive upper timestamp bound of the query, if any
+            
+        Yields:
+            Lists of rows from buckets changed since their last push
+        """
+        # Buckets from the first to start at or after start_date up to, but
+        # excluding, the one holding end_date are whole
+        first_whole = _naive_utc(start_date).ceil(CHECKPOINT_FREQ) if start_date else None
+        past_whole = _naive_utc(end_date).floor(CHECKPOINT_FREQ) if end_date else None
+        
+        for chunk in _whole_buckets(self._read_chunks(query, model)):
+            frame = to_frame(chunk)
+            buckets = chunk["timestamp"].dt.floor(CHECKPOINT_FREQ)
+            
+            partial = np.zeros(len(buckets), dtype=bool)
+            if first_whole is not None:
+                partial |= (buckets < first_whole).to_numpy()
+            if past_whole is not None:
+                partial |= (buckets >= past_whole).to_numpy()
+            
+            changed = partial.copy()
+            if not partial.all():
+                changed[~partial] = self._changed_buckets(table_name, frame[~partial], buckets[~partial])
+            rows = _to_rows(frame[changed], row_type) if changed.any() else None
+            
+            # Drop the chunk's frames while suspended, so only the row lists
+            # being pushed and built stay alive
+            del chunk, frame, buckets, partial, changed
+            if rows:
+                yield rows
+    
+    def _changed_buckets(self, table_name: str, frame: pd.DataFrame, buckets: pd.Series) -> np.ndarray:
+        """
+        Find the rows of (region, time bucket) groups changed since last pushed
+        
+        Each bucket's checksum, the wrapping sum of its row hashes, is compared
+        with the stored checkpoint; the checkpoints of new and changed buckets
+        are written in the current transaction, which the sync commits once its
+        pushes have succeeded. A changed bucket is pushed in full, on top of
+        the rows pushed for it before.
+        
+        Args:
+            table_name: Dataset table the rows are pushed to
+            frame: PowerBI rows with a Region column
+            buckets: Time bucket of each row
+            
+        Returns:
+            Boolean mask of the rows in changed buckets
+        """
+        regions = frame["Region"]
+        hashes = pd.util.hash_pandas_object(frame, index=False).groupby([regions, buckets]).sum()
+        
+        stored = {
+            (region, bucket_start): (checkpoint_id, row_hash)
+            for checkpoint_id, region, bucket_start, row_hash in self.db.query(
+                SyncCheckpoint.id,
+                SyncCheckpoint.region,
+                SyncCheckpoint.bucket_start,
+                SyncCheckpoint.row_hash
+            ).filter(
+                SyncCheckpoint.table_name == table_name,
+                SyncCheckpoint.bucket_start >= buckets.iloc[0].to_pydatetime(),
+                SyncCheckpoint.bucket_start <= buckets.iloc[-1].to_pydatetime()
+            )
+        }
+        
+        changed, inserts, updates = [], [], []
+        now = datetime.utcnow()
+        for (region, bucket), value in hashes.items():
+            row_hash = format(int(value), "016x")
+            bucket_start = bucket.to_pydatetime()
+            checkpoint_id, stored_hash = stored.get((region, bucket_start), (None, None))
+            if stored_hash == row_hash:
+                continue
+            
+            changed.append((region, bucket))
+            if checkpoint_id is None:
+                inserts.append({
+                    "table_name": table_name,
+                    "region": region,
+                    "bucket_start": bucket_start,
+                    "row_hash": row_hash,
+                    "last_synced_at": now
+                })
+            else:
+                updates.append({"id": checkpoint_id, "row_hash": row_hash, "last_synced_at": now})
+        
+        if inserts:
+            self.db.bulk_insert_mappings(SyncCheckpoint, inserts)
+        if updates:
+            self.db.bulk_update_mappings(SyncCheckpoint, updates)
+            # Push tables are append-only, so the re-pushed buckets' earlier
+            # rows stay in PowerBI until the table is cleared
+            logger.warning(
+                f"{len(updates)} {table_name} buckets changed since their last push; "
+                f"sync with clear_existing=True to drop their previously pushed rows"
+            )
+        
+        return pd.MultiIndex.from_arrays([regions, buckets]).isin(changed)
+    
+    def _reset_checkpoints(self, table_name: str) -> None:
+        """
+        Forget the pushed buckets of a table, so the next sync pushes all rows
+        
+        Args:
+            table_name: Dataset table that was cleared
+        """
+        self.db.query(SyncCheckpoint).filter(
+            SyncCheckpoint.table_name == table_name
+        ).delete(synchronize_session=False)
+    
+    def _push_chunks(self, table_name: str, row_chunks: Iterable[List[Any]], label: str,
+                     cleared: Optional[Future] = None) -> int:
+        """
+        Push chunks of rows to a dataset table
+        
+        Each chunk is pushed on a background thread while the next one is
+        read and converted, so database and PowerBI round trips overlap. At
+        most one push is in flight, keeping two chunks in memory.
+        
+        Args:
+            table_name: Dataset table to push to
+            row_chunks: Iterable of PowerBI row lists
+            label: Record type name for progress logging
+            cleared: Pending clear of the table, waited for before the first push
+            
+        Returns:
+            int: Number of rows pushed
+        """
+        total_synced = 0
+        pending = None
+        
+        def finish(push) -> None:
+            nonlocal total_synced
+            future, count = push
+            future.result()
+            total_synced += count
+            logger.info(f"Synced {total_synced} {label} records to PowerBI")
+        
+        for powerbi_data in row_chunks:
+            if cleared is not None:
+                cleared.result()
+                cleared = None
+            if pending is not None:
+                finish(pending)
+            
+            future = _background.submit(
+                self.client.push_data_to_dataset,
+                self.dataset_id,
+                table_name,
+                powerbi_data,
+                self.workspace_id
+            )
+            pending = (future, len(powerbi_data))
+        
+        if cleared is not None:
+            cleared.result()
+        if pending is not None:
+            finish(pending)
+        
+        return total_synced
+    
     def sync_energy_consumption_data(self, start_date: Optional[datetime] = None, 
                                    end_date: Optional[datetime] = None,
                                    clear_existing: bool = False) -> bool:
@@ -80,7 +582,8 @@ class PowerBIService:
         Args:
             start_date: Start date for data sync (None for all data)
             end_date: End date for data sync (None for current time)
-            clear_existing: Whether to clear existing data first
+            clear_existing: Whether to clear existing data first; without it, rows
+                of buckets changed since their last push are appended again
             
         Returns:
             bool: True if successful
@@ -90,67 +593,50 @@ class PowerBIService:
                 if not self.initialize_powerbi_workspace():
                     return False
             
-            # Clear existing data if requested
+            # Clear existing data if requested, while the first chunk is read
+            cleared = None
             if clear_existing:
                 logger.info("Clearing existing energy consumption data in PowerBI")
-                self.client.clear_dataset_table(
-                    self.dataset_id, 
-                    "EnergyConsumption", 
+                cleared = _background.submit(
+                    self.client.clear_dataset_table,
+                    self.dataset_id,
+                    "EnergyConsumption",
                     self.workspace_id
                 )
-            
-            # Query energy consumption data
-            query = self.db.query(EnergyConsumption)
+                self._reset_checkpoints("EnergyConsumption")
+            
+            # Query energy consumption data, selecting only the synced columns
+            query = self.db.query(
+                EnergyConsumption.id,
+                EnergyConsumption.timestamp,
+                EnergyConsumption.region,
+                EnergyConsumption.consumption_mwh,
+                EnergyConsumption.temperature,
+                EnergyConsumption.is_holiday
+            )
             
             if start_date:
                 query = query.filter(EnergyConsumption.timestamp >= start_date)
             if end_date:
                 query = query.filter(EnergyConsumption.timestamp <= end_date)
             
-            # Get data in batches to avoid memory issues
-            batch_size = 1000
-            offset = 0
-            total_synced = 0
+            # Read and push in chunks to avoid memory issues
+            total_synced = self._push_chunks(
+                "EnergyConsumption",
+                self._read_changed_rows("EnergyConsumption", query, EnergyConsumption, _energy_consumption_frame, EnergyConsumptionRow, start_date, end_date),
+                "energy consumption",
+                cleared
+            )
             
-            while True:
-                batch_data = query.offset(offset).limit(batch_size).all()
-                
-                if not batch_data:
-                    break
-                
-                # Convert to PowerBI format
-                powerbi_data = []
-                for record in batch_data:
-                    powerbi_data.append({
-                        "Timestamp": record.timestamp.isoformat(),
-                        "Region": record.region or "Unknown",
-                        "ConsumptionMWh": float(record.consumption_mwh or 0),
-                        "Temperature": float(record.temperature or 0),
-                        "IsHoliday": bool(record.is_holiday),
-                        "HourOfDay": record.timestamp.hour,
-                        "DayOfWeek": record.timestamp.weekday(),
-                        "Month": record.timestamp.month,
-                        "Year": record.timestamp.year,
-                        "Season": self._get_season(record.timestamp.month)
-                    })
-                
-                # Push to PowerBI
-                self.client.push_data_to_dataset(
-                    self.dataset_id,
-                    "EnergyConsumption",
-                    powerbi_data,
-                    self.workspace_id
-                )
-                
-                total_synced += len(powerbi_data)
-                offset += batch_size
-                
-                logger.info(f"Synced {total_synced} energy consumption records to PowerBI")
+            # Record the pushed buckets only once every push has succeeded
+            self.db.commit()
             
             logger.info(f"Energy consumption data sync completed. Total records: {total_synced}")
             return True
             
         except Exception as e:
+            self.db.rollback()
+            self._forget_ids_if_missing(e)
             logger.error(f"Failed to sync energy consumption data: {str(e)}")
             return False
     
@@ -163,7 +649,8 @@ class PowerBIService:
         Args:
             start_date: Start date for data sync
             end_date: End date for data sync
-            clear_existing: Whether to clear existing data first
+            clear_existing: Whether to clear existing data first; without it, rows
+                of buckets changed since their last push are appended again
             
         Returns:
             bool: True if successful
@@ -173,50 +660,49 @@ class PowerBIService:
                 if not self.initialize_powerbi_workspace():
                     return False
             
+            # Clear existing data if requested, while the first chunk is read
+            cleared = None
             if clear_existing:
                 logger.info("Clearing existing anomaly data in PowerBI")
-                self.client.clear_dataset_table(
+                cleared = _background.submit(
+                    self.client.clear_dataset_table,
                     self.dataset_id,
                     "Anomalies",
                     self.workspace_id
                 )
-            
-            # Query anomaly data
-            query = self.db.query(Anomaly)
+                self._reset_checkpoints("Anomalies")
+            
+            # Query anomaly data, selecting only the synced columns
+            query = self.db.query(
+                Anomaly.id,
+                Anomaly.timestamp,
+                Anomaly.region,
+                Anomaly.actual_value,
+                Anomaly.predicted_value,
+                Anomaly.anomaly_score,
+                Anomaly.is_confirmed
+            )
             
             if start_date:
                 query = query.filter(Anomaly.timestamp >= start_date)
             if end_date:
                 query = query.filter(Anomaly.timestamp <= end_date)
             
-            anomalies = query.all()
-            
-            if anomalies:
-                powerbi_data = []
-                for anomaly in anomalies:
-                    powerbi_data.append({
-                        "Timestamp": anomaly.timestamp.isoformat(),
-                        "Region": anomaly.region or "Unknown",
-                        "ActualValue": float(anomaly.actual_value or 0),
-                        "PredictedValue": float(anomaly.predicted_value or 0),
-                        "AnomalyScore": float(anomaly.anomaly_score or 0),
-                        "IsConfirmed": bool(anomaly.is_confirmed),
-                        "DetectionMethod": "IsolationForest"  # Default method
-                    })
-                
-                # Push to PowerBI
-                self.client.push_data_to_dataset(
-                    self.dataset_id,
-                    "Anomalies",
-                    powerbi_data,
-                    self.workspace_id
-                )
-                
-                logger.info(f"Synced {len(powerbi_data)} anomaly records to PowerBI")
+            self._push_chunks(
+                "Anomalies",
+                self._read_changed_rows("Anomalies", query, Anomaly, _anomaly_frame, AnomalyRow, start_date, end_date),
+                "anomaly",
+                cleared
+            )
+            
+            # Record the pushed buckets only once every push has succeeded
+            self.db.commit()
             
             return True
             
         except Exception as e:
+            self.db.rollback()
+            self._forget_ids_if_missing(e)
             logger.error(f"Failed to sync anomaly data: {str(e)}")
             return False
     
@@ -243,22 +729,20 @@ class PowerBIService:
                     self.workspace_id
                 )
             
-            # Query power plant data
-            power_plants = self.db.query(PowerPlant).all()
-            
-            if power_plants:
-                powerbi_data = []
-                for plant in power_plants:
-                    powerbi_data.append({
-                        "Id": plant.id,
-                        "Name": plant.name or "Unknown",
-                        "Region": plant.region or "Unknown",
-                        "CapacityMW": float(plant.capacity_mw or 0),
-                        "FuelType": plant.fuel_type or "Unknown",
-                        "CommissioningYear": 2020,  # Default value
-                        "Latitude": 0.0,  # Would need to add these fields to model
-                        "Longitude": 0.0
-                    })
+            # Query power plant data, selecting only the synced columns
+            power_plants = pd.read_sql_query(
+                self.db.query(
+                    PowerPlant.id,
+                    PowerPlant.name,
+                    PowerPlant.region,
+                    PowerPlant.capacity_mw,
+                    PowerPlant.fuel_type
+                ).statement,
+                self.db.connection()
+            )
+            
+            if not power_plants.empty:
+                powerbi_data = _to_rows(_power_plant_frame(power_plants), PowerPlantRow)
                 
                 # Push to PowerBI
                 self.client.push_data_to_dataset(
@@ -273,6 +757,7 @@ class PowerBIService:
             return True
             
         except Exception as e:
+            self._forget_ids_if_missing(e)
             logger.error(f"Failed to sync power plant data: {str(e)}")
             return False
     
@@ -298,7 +783,8 @@ class PowerBIService:
                 self.workspace_id
             )
             
-            # Format data for PowerBI
+            # Format data for PowerBI; every row of the batch shares one creation time
+            created_at = datetime.utcnow()
             powerbi_data = []
             for forecast in forecast_data:
                 powerbi_data.append({
@@ -308,7 +794,7 @@ class PowerBIService:
                     "ConfidenceIntervalLow": float(forecast.get("confidence_low", 0)),
                     "ConfidenceIntervalHigh": float(forecast.get("confidence_high", 0)),
                     "ModelType": forecast.get("model_type", "Prophet"),
-                    "CreatedAt": datetime.utcnow().isoformat()
+                    "CreatedAt": created_at
                 })
             
             # Push to PowerBI
@@ -324,6 +810,7 @@ class PowerBIService:
             return True
             
         except Exception as e:
+            self._forget_ids_if_missing(e)
             logger.error(f"Failed to push forecast data: {str(e)}")
             return False
     
@@ -337,14 +824,7 @@ class PowerBIService:
         Returns:
             str: Season name
         """
-        if 3 <= month <= 5:
-            return "Spring"
-        elif 6 <= month <= 8:
-            return "Summer"
-        elif 9 <= month <= 11:
-            return "Autumn"
-        else:
-            return "Winter"
+        return _SEASON_BY_MONTH[month]
     
     def refresh_dataset(self) -> bool:
         """
@@ -364,6 +844,7 @@ class PowerBIService:
             return True
             
         except Exception as e:
+            self._forget_ids_if_missing(e)
             logger.error(f"Failed to refresh dataset: {str(e)}")
             return False
 
@@ -411,20 +892,31 @@ class PowerBIService:
                 if not self.initialize_powerbi_workspace():
                     return False
             
-            # Sync all data types
-            results = [
-                self.sync_energy_consumption_data(
-                    start_date=start_date,
-                    end_date=end_date,
-                    clear_existing=clear_existing
-                ),
-                self.sync_anomaly_data(
-                    start_date=start_date,
-                    end_date=end_date,
-                    clear_existing=clear_existing
-                ),
-                self.sync_power_plant_data(clear_existing=clear_existing)
-            ]
+            # Sync all data types concurrently; each sync waits mostly on
+            # PowerBI round trips, and gets its own database session
+            with ThreadPoolExecutor(max_workers=SYNC_WORKERS) as executor:
+                futures = [
+                    executor.submit(
+                        self._sync_in_own_session,
+                        "sync_energy_consumption_data",
+                        start_date=start_date,
+                        end_date=end_date,
+                        clear_existing=clear_existing
+                    ),
+                    executor.submit(
+                        self._sync_in_own_session,
+                        "sync_anomaly_data",
+                        start_date=start_date,
+                        end_date=end_date,
+                        clear_existing=clear_existing
+                    ),
+                    executor.submit(
+                        self._sync_in_own_session,
+                        "sync_power_plant_data",
+                        clear_existing=clear_existing
+                    )
+                ]
+                results = [future.result() for future in futures]
             
             # Refresh dataset to make sure all data is available
             if all(results):
@@ -435,3 +927,25 @@ class PowerBIService:
         except Exception as e:
             logger.error(f"Failed to sync all data: {str(e)}")
             return False
+    
+    def _sync_in_own_session(self, sync_method: str, **kwargs) -> bool:
+        """
+        Run a sync method with a separate database session
+        
+        Sessions are not thread-safe, so concurrent syncs each run on a
+        shallow copy of the service bound to a new session.
+        
+        Args:
+            sync_method: Name of the sync method to run
+            **kwargs: Arguments for the sync method
+            
+        Returns:
+            bool: Result of the sync method
+        """
+        session = Session(bind=self.db.get_bind())
+        try:
+            worker = copy.copy(self)
+            worker.db = session
+            return getattr(worker, sync_method)(**kwargs)
+        finally:
+            session.close()
@@ -2,49 +2,114 @@
 import pytest
 import tempfile
 import os
-from datetime import datetime, timedelta
-from sqlalchemy import create_engine
+from datetime import datetime
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
 import pandas as pd
 import numpy as np
 
 from src.models.energy_models import Base, User, EnergyConsumption
-from src.config.database import get_db_session
+from src.config.database import SessionLocal, engine as app_engine, get_db_session
 from src.main import app
 from src.auth.auth_utils import get_password_hash, create_access_token
 
-# Test database URL
-TEST_DATABASE_URL = "sqlite:///./test.db"
+# Test database URL; in memory, shared by all sessions through a StaticPool
+TEST_DATABASE_URL = "sqlite:///:memory:"
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--runslow", action="store_true", default=False,
+        help="run tests marked slow (real model fits; nightly CI)"
+    )
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: real model fits, run with --runslow")
+
+def pytest_collection_modifyitems(config, items):
+    """Skip slow tests unless --runslow is given"""
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="needs --runslow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
 
 @pytest.fixture(scope="session")
 def test_engine():
-    """Create test database engine"""
-    engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+    """Create test database engine
+    
+    The database lives in this process's memory, so each pytest-xdist
+    worker gets its own and `pytest -n auto` needs no further isolation.
+    """
+    engine = create_engine(
+        TEST_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    
+    # Let SQLAlchemy issue BEGIN itself; pysqlite's own transaction handling
+    # breaks the SAVEPOINTs test_db relies on
+    @event.listens_for(engine, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(engine, "begin")
+    def begin_transaction(conn):
+        conn.exec_driver_sql("BEGIN")
+    
     Base.metadata.create_all(bind=engine)
     yield engine
-    Base.metadata.drop_all(bind=engine)
+    # The database goes away with its connection
+    engine.dispose()
+
+@pytest.fixture(scope="session", autouse=True)
+def bind_app_sessions(test_engine):
+    """Point the application's session factory at the test database"""
+    # Code that opens its own sessions (get_db_session, the ETL loaders)
+    # would otherwise reach the configured DATABASE_URL
+    SessionLocal.configure(bind=test_engine)
+    yield
+    SessionLocal.configure(bind=app_engine)
 
 @pytest.fixture(scope="function")
 def test_db(test_engine):
-    """Create test database session"""
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    """Create test database session, rolled back after each test"""
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=connection)
     session = TestingSessionLocal()
     
+    # Commits in the code under test end a SAVEPOINT, not the outer transaction
+    session.begin_nested()
+    
+    @event.listens_for(session, "after_transaction_end")
+    def restart_savepoint(session, transaction):
+        if transaction.nested and not transaction._parent.nested:
+            session.begin_nested()
+    
     yield session
     
     session.close()
-    # Clean up data after each test
-    for table in reversed(Base.metadata.sorted_tables):
-        test_engine.execute(table.delete())
+    transaction.rollback()
+    connection.close()
+
+@pytest.fixture(scope="session")
+def password_hashes():
+    """Hash the test passwords once per session; bcrypt is slow by design"""
+    return {
+        "testpassword": get_password_hash("testpassword"),
+        "adminpassword": get_password_hash("adminpassword")
+    }
 
 @pytest.fixture
-def test_user(test_db):
+def test_user(test_db, password_hashes):
     """Create a test user"""
     user = User(
         username="testuser",
         email="test@example.com",
-        hashed_password=get_password_hash("testpassword"),
+        hashed_password=password_hashes["testpassword"],
         full_name="Test User",
         is_active=True,
         is_superuser=False
@@ -55,12 +120,12 @@ def test_user(test_db):
     return user
 
 @pytest.fixture
-def test_admin_user(test_db):
+def test_admin_user(test_db, password_hashes):
     """Create a test admin user"""
     admin = User(
         username="admin",
         email="admin@example.com",
-        hashed_password=get_password_hash("adminpassword"),
+        hashed_password=password_hashes["adminpassword"],
         full_name="Admin User",
         is_active=True,
         is_superuser=True
@@ -91,20 +156,16 @@ def test_client(test_db):
 @pytest.fixture
 def sample_energy_data():
     """Generate sample energy consumption data"""
-    data = []
-    start_date = datetime(2023, 1, 1)
-    
-    for i in range(100):
-        timestamp = start_date + timedelta(hours=i)
-        data.append({
-            'timestamp': timestamp,
-            'region': 'test_region',
-            'consumption_mwh': 100 + 50 * np.sin(i / 24 * 2 * np.pi) + np.random.normal(0, 5),
-            'temperature': 20 + 10 * np.sin(i / 24 * 2 * np.pi) + np.random.normal(0, 2),
-            'is_holiday': i % 168 == 0  # Every week
-        })
+    i = np.arange(100)
+    daily_cycle = np.sin(i / 24 * 2 * np.pi)
     
-    return pd.DataFrame(data)
+    return pd.DataFrame({
+        'timestamp': pd.date_range(datetime(2023, 1, 1), periods=100, freq='H'),
+        'region': 'test_region',
+        'consumption_mwh': 100 + 50 * daily_cycle + np.random.normal(0, 5, 100),
+        'temperature': 20 + 10 * daily_cycle + np.random.normal(0, 2, 100),
+        'is_holiday': i % 168 == 0  # Every week
+    })
 
 @pytest.fixture
 def sample_csv_file(sample_energy_data):
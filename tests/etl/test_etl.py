@@ -1,8 +1,13 @@
 # tests/test_etl.py - ETL tests
+import json
 import pytest
-from datetime import datetime
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta, timezone
 from src.etl.extractors.smart_meter_extractor import SmartMeterExtractor
 from src.etl.transformers.energy_transformer import EnergyConsumptionTransformer
+from src.etl.transformers._kernels import calendar_fields
+from src.etl.utils import _json_serializer
 from src.etl.loaders.database import DatabaseLoader
 
 class TestSmartMeterExtractor:
@@ -36,6 +41,65 @@ class TestEnergyTransformer:
         assert all('consumption_mwh' in record for record in transformed_data)
         assert all('temperature' in record for record in transformed_data)
 
+    def test_derived_features_from_aware_timestamps(self):
+        """Test calendar features follow the local wall time of aware timestamps"""
+        transformer = EnergyConsumptionTransformer(region="test_region")
+        tz = timezone(timedelta(hours=5))
+        timestamps = [datetime(2023, 12, 31, 22, tzinfo=tz), datetime(2024, 2, 29, 3, tzinfo=tz)]
+        
+        transformed_data = transformer.transform([
+            {'timestamp': ts, 'consumption_mwh': 100.0} for ts in timestamps
+        ])
+        
+        index = pd.DatetimeIndex(timestamps)
+        assert [r['hour_of_day'] for r in transformed_data] == index.hour.tolist()
+        assert [r['day_of_week'] for r in transformed_data] == index.dayofweek.tolist()
+        assert [r['month'] for r in transformed_data] == index.month.tolist()
+        assert [r['year'] for r in transformed_data] == index.year.tolist()
+
+class TestCalendarFields:
+    def test_matches_datetime_index(self):
+        """Test the kernel against the DatetimeIndex accessors"""
+        index = pd.DatetimeIndex([
+            '2023-01-01 00:00', '2024-02-29 23:59', '2024-03-01 00:00',
+            '2000-02-29 12:00', '1900-03-01 01:00', '1969-12-31 23:00',
+            '1970-01-01 00:00', '2100-12-31 13:30'
+        ])
+        index = index.append(pd.DatetimeIndex(
+            np.random.default_rng(0).integers(-2_000_000_000, 4_000_000_000, 1000).astype('datetime64[s]')
+        ))
+        
+        hour, day_of_week, month, year = calendar_fields(index.asi8)
+        
+        np.testing.assert_array_equal(hour, index.hour)
+        np.testing.assert_array_equal(day_of_week, index.dayofweek)
+        np.testing.assert_array_equal(month, index.month)
+        np.testing.assert_array_equal(year, index.year)
+
+class TestJsonSerializer:
+    def test_datetime_series_matches_isoformat(self):
+        """Test datetime arrays keep sub-seconds and offsets, with null for NaT"""
+        values = pd.Series(pd.to_datetime([
+            '2024-01-01 00:00:00.250+00:00', None, '2024-06-01 12:00:00+00:00'
+        ])).dt.tz_convert('Europe/Berlin')
+        expected = [
+            '2024-01-01T01:00:00.250000+01:00', None, '2024-06-01T14:00:00+02:00'
+        ]
+        
+        assert json.loads(json.dumps(values, default=_json_serializer)) == {
+            str(i): value for i, value in enumerate(expected)
+        }
+        assert json.loads(json.dumps(pd.DatetimeIndex(values), default=_json_serializer)) == expected
+        assert expected[0] == values[0].isoformat()
+    
+    def test_naive_datetime_series(self):
+        """Test naive datetime arrays have no offset"""
+        values = pd.Series(pd.to_datetime(['2024-01-01 00:00:00.5', '2024-01-01 01:00:00', None]))
+        
+        assert json.loads(json.dumps(values, default=_json_serializer)) == {
+            '0': '2024-01-01T00:00:00.500000', '1': '2024-01-01T01:00:00', '2': None
+        }
+
 class TestDatabaseLoader:
     def test_load_data(self, test_db, sample_energy_data):
         """Test loading data into the database"""
@@ -0,0 +1,93 @@
+# tests/powerbi/test_powerbi_sync.py - Incremental PowerBI sync tests
+import pytest
+from datetime import datetime, timedelta
+from src.models.energy_models import EnergyConsumption, SyncCheckpoint
+from src.powerbi.client import PowerBIConfig
+from src.powerbi.service import PowerBIService
+
+BASE = datetime(2023, 1, 1)
+
+class FakePowerBIClient:
+    """Records pushed rows instead of calling the PowerBI API"""
+    def __init__(self):
+        self.pushed = []
+    
+    def push_data_to_dataset(self, dataset_id, table_name, data, workspace_id=None):
+        self.pushed.extend(data)
+        return True
+    
+    def clear_dataset_table(self, dataset_id, table_name, workspace_id=None):
+        self.pushed = []
+        return True
+
+@pytest.fixture
+def sync_service(test_db):
+    """PowerBI service on the test database, with half-hourly readings over three hours"""
+    test_db.add_all([
+        EnergyConsumption(
+            timestamp=BASE + timedelta(minutes=30 * i),
+            region="north",
+            consumption_mwh=100.0 + i,
+            temperature=10.0,
+            is_holiday=False
+        )
+        for i in range(6)
+    ])
+    test_db.commit()
+    
+    service = PowerBIService(PowerBIConfig("tenant", "client", "secret"), db_session=test_db)
+    service.client = FakePowerBIClient()
+    service.workspace_id = "workspace"
+    service.dataset_id = "dataset"
+    return service
+
+def _checkpointed_buckets(db):
+    return sorted(bucket for bucket, in db.query(SyncCheckpoint.bucket_start).filter(
+        SyncCheckpoint.table_name == "EnergyConsumption"
+    ))
+
+class TestIncrementalSync:
+    def test_unchanged_buckets_are_skipped(self, sync_service):
+        """Test a second sync pushes nothing when no rows changed"""
+        assert sync_service.sync_energy_consumption_data()
+        assert len(sync_service.client.pushed) == 6
+        
+        sync_service.client = FakePowerBIClient()
+        assert sync_service.sync_energy_consumption_data()
+        assert sync_service.client.pushed == []
+    
+    def test_changed_bucket_is_pushed_in_full(self, sync_service, test_db):
+        """Test only the bucket holding a changed row is pushed again"""
+        assert sync_service.sync_energy_consumption_data()
+        
+        row = test_db.query(EnergyConsumption).filter(
+            EnergyConsumption.timestamp == BASE + timedelta(hours=1, minutes=30)
+        ).one()
+        row.consumption_mwh = -1.0
+        test_db.commit()
+        
+        sync_service.client = FakePowerBIClient()
+        assert sync_service.sync_energy_consumption_data()
+        pushed = sync_service.client.pushed
+        assert [r.Timestamp for r in pushed] == [BASE + timedelta(hours=1), BASE + timedelta(hours=1, minutes=30)]
+        assert [r.ConsumptionMWh for r in pushed] == [102.0, -1.0]
+    
+    def test_range_edge_buckets_are_not_checkpointed(self, sync_service, test_db):
+        """Test partial buckets at a mid-hour range's edges are pushed but not recorded"""
+        assert sync_service.sync_energy_consumption_data(
+            start_date=BASE + timedelta(minutes=30),
+            end_date=BASE + timedelta(hours=2, minutes=30)
+        )
+        assert len(sync_service.client.pushed) == 5
+        assert _checkpointed_buckets(test_db) == [BASE + timedelta(hours=1)]
+        
+        # The edge buckets are compared in full on the next sync
+        sync_service.client = FakePowerBIClient()
+        assert sync_service.sync_energy_consumption_data()
+        assert [r.Timestamp for r in sync_service.client.pushed] == [
+            BASE,
+            BASE + timedelta(minutes=30),
+            BASE + timedelta(hours=2),
+            BASE + timedelta(hours=2, minutes=30)
+        ]
+        assert _checkpointed_buckets(test_db) == [BASE + timedelta(hours=i) for i in range(3)]
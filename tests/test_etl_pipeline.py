@@ -1,67 +1,62 @@
-""
+"""
 Test ETL Pipeline
 
 This module contains tests for the ETL pipeline.
 """
+import math
 import os
 import sys
 import pytest
 from datetime import datetime, timedelta
-from unittest.mock import MagicMock, patch
+from typing import Optional
+from unittest.mock import Mock, patch
 import pandas as pd
 import numpy as np
+from sqlalchemy import event, func, select
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.etl.extractors.base import BaseExtractor
+from src.etl.base import BaseExtractor
 from src.etl.transformers.energy_transformer import EnergyConsumptionTransformer
 from src.etl.loaders.database import DatabaseLoader
 from src.etl.base import ETLPipeline, ETLPipelineBuilder
-from src.models.energy_models import EnergyConsumption, Anomaly, Base
-from src.config.database import get_db_session, engine
+from src.models.energy_models import EnergyConsumption, Anomaly
 
 # Test data
-def generate_test_data(n: int = 10) -> list[dict]:
+def generate_test_data(n: int = 10, rng: Optional[np.random.Generator] = None) -> list[dict]:
     """Generate test data for the ETL pipeline."""
-    base_time = datetime.utcnow()
-    data = []
-    
-    for i in range(n):
-        timestamp = base_time - timedelta(hours=i)
-        data.append({
-            'timestamp': timestamp.isoformat(),
-            'consumption_mwh': 100.0 + (i * 0.5) + (np.random.rand() * 10 - 5),
-            'region': 'test_region',
-            'temperature': 20.0 + (np.random.rand() * 10 - 5),
-            'is_holiday': 1 if i % 7 == 0 else 0  # Every 7th record is a holiday
-        })
-    
-    return data
+    rng = rng if rng is not None else np.random.default_rng()
+    idx = np.arange(n)
+    
+    # Build whole columns and only convert to records at the end
+    df = pd.DataFrame({
+        'timestamp': pd.date_range(
+            end=datetime.utcnow(), periods=n, freq='H'
+        )[::-1].strftime('%Y-%m-%d %H:%M:%S'),
+        'consumption_mwh': 100.0 + idx * 0.5 + rng.uniform(-5, 5, n),
+        'region': 'test_region',
+        'temperature': 20.0 + rng.uniform(-5, 5, n),
+        'is_holiday': (idx % 7 == 0).astype(int)  # Every 7th record is a holiday
+    })
+    
+    return df.to_dict('records')
 
 # Fixtures
-@pytest.fixture(scope="module")
-def db_session():
-    """Create a clean database session for testing."""
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
-    
-    # Create a new session for testing
-    session = get_db_session()
-    
-    yield session
-    
-    # Clean up after tests
-    session.close()
-    Base.metadata.drop_all(bind=engine)
-
 @pytest.fixture
+def db_session(test_db):
+    """Database session whose writes are rolled back after each test."""
+    # test_db keeps each test inside a SAVEPOINT, so loader commits never
+    # leak rows into the next test
+    return test_db
+
+@pytest.fixture(scope="module")
 def test_data() -> list[dict]:
     """Generate test data."""
     return generate_test_data(100)
 
 @pytest.fixture
-extractor():
+def extractor():
     """Create a mock extractor for testing."""
     class TestExtractor(BaseExtractor):
         def extract(self, *args, **kwargs):
@@ -69,15 +64,20 @@ extractor():
     
     return TestExtractor()
 
-@pytest.fixture
-transformer():
+@pytest.fixture(scope="module")
+def transformer():
     """Create a transformer for testing."""
     return EnergyConsumptionTransformer(region='test_region')
 
+@pytest.fixture(scope="module")
+def transformed_test_data(transformer, test_data) -> list[dict]:
+    """Transform the test data once for every test that loads it."""
+    return transformer.transform(test_data)
+
 @pytest.fixture
 def loader(db_session):
     """Create a database loader for testing."""
-    return DatabaseLoader(db_session, batch_size=5)
+    return DatabaseLoader(db_session, batch_size=1000)
 
 # Tests
 def test_extractor(extractor):
@@ -88,9 +88,9 @@ def test_extractor(extractor):
     assert all(isinstance(item, dict) for item in data)
     assert all('consumption_mwh' in item for item in data)
 
-def test_transformer(transformer, test_data):
+def test_transformer(transformed_test_data, test_data):
     """Test the transformer."""
-    transformed = transformer.transform(test_data)
+    transformed = transformed_test_data
     
     assert isinstance(transformed, list)
     assert len(transformed) == len(test_data)
@@ -110,22 +110,54 @@ def test_transformer(transformer, test_data):
         assert 'season' in item
         assert 'data_quality_score' in item
 
-def test_loader(loader, test_data, transformer):
+def test_loader(loader, test_data, transformed_test_data):
     """Test the database loader."""
-    # Transform the test data first
-    transformed = transformer.transform(test_data)
-    
     # Load the data
-    result = loader.load(transformed)
+    result = loader.load(transformed_test_data)
     
     # Check that the load was successful
-    assert result is True
+    assert result['status'] == 'success'
+    assert result['records_loaded'] == len(test_data)
     
     # Verify the data was loaded into the database
     session = loader.db
-    count = session.query(EnergyConsumption).count()
+    session.expire_all()
+    count = session.execute(select(func.count()).select_from(EnergyConsumption)).scalar()
     assert count == len(test_data)
 
+def test_loader_batches_inserts(db_session):
+    """Test that the loader inserts each batch in a single round-trip."""
+    start = datetime(2023, 1, 1)
+    records = [
+        {
+            'timestamp': start + timedelta(hours=i),
+            'consumption_mwh': 100.0 + i,
+            'region': 'test_region',
+            'temperature': 20.0,
+            'is_holiday': False,
+            'is_anomaly': False
+        }
+        for i in range(25)
+    ]
+    loader = DatabaseLoader(db_session, batch_size=10)
+    
+    # Record every INSERT the loader sends to the database
+    inserts = []
+    def record_insert(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO energy_consumption"):
+            inserts.append(executemany)
+    
+    connection = db_session.connection()
+    event.listen(connection, "before_cursor_execute", record_insert)
+    try:
+        stats = loader.load(records)
+    finally:
+        event.remove(connection, "before_cursor_execute", record_insert)
+    
+    assert stats['records_loaded'] == len(records)
+    assert len(inserts) <= math.ceil(len(records) / loader.batch_size)
+    assert all(inserts)
+
 def test_etl_pipeline(extractor, transformer, loader):
     """Test the entire ETL pipeline."""
     # Create the pipeline
@@ -139,8 +171,9 @@ def test_etl_pipeline(extractor, transformer, loader):
     # Run the pipeline
     result = pipeline.run()
     
-    # Check that the pipeline completed successfully
-    assert result is True
+    # Check that the pipeline completed successfully; run() returns the loader's stats
+    assert result['status'] == 'success'
+    assert result['records_loaded'] == 10
     
     # Get statistics
     stats = pipeline.get_stats()
@@ -157,15 +190,17 @@ def test_etl_pipeline(extractor, transformer, loader):
     
     # Check that the data was loaded into the database
     session = loader.db
-    count = session.query(EnergyConsumption).count()
-    assert count > 0
+    session.expire_all()
+    count = session.execute(select(func.count()).select_from(EnergyConsumption)).scalar()
+    assert count == 10
 
 def test_etl_pipeline_builder():
     """Test the ETL pipeline builder."""
-    # Create a mock extractor, transformer, and loader
-    mock_extractor = MagicMock(spec=BaseExtractor)
-    mock_transformer = MagicMock()
-    mock_loader = MagicMock()
+    # Create a mock extractor, transformer, and loader; a spec_set list
+    # avoids introspecting the BaseExtractor class hierarchy
+    mock_extractor = Mock(spec_set=['extract'])
+    mock_transformer = Mock(spec_set=['transform'])
+    mock_loader = Mock(spec_set=['load'])
     
     # Configure the mocks
     mock_extractor.extract.return_value = [{'test': 'data'}]
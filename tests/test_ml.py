@@ -2,54 +2,90 @@ import pytest
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from unittest.mock import patch
+from darts import TimeSeries
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from src.ml.anomaly_detection import AnomalyDetector
 from src.ml.forecasting import EnergyForecaster
 from src.ml.service import MLService
-from src.models.energy_models import EnergyConsumption, Base
-from src.config.database import engine, get_db_session
+from src.models.energy_models import EnergyConsumption
 
 # Create test database
 @pytest.fixture(scope="module")
-def test_db():
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
-    
-    # Create a test session
-    db = Session(engine)
-    
-    # Add test data
-    test_data = []
-    start_date = datetime(2023, 1, 1)
-    for i in range(100):
-        timestamp = start_date + timedelta(hours=i)
-        consumption = 100 + 50 * np.sin(i / 24 * 2 * np.pi) + np.random.normal(0, 5)
-        test_data.append({
-            'timestamp': timestamp,
-            'region': 'test_region',
-            'consumption_mwh': max(10, consumption),  # Ensure positive consumption
-            'temperature': 20 + 10 * np.sin(i / 24 * 2 * np.pi) + np.random.normal(0, 2)
-        })
+def test_db(test_engine):
+    # Create a test session; test_engine creates the schema once per test session
+    db = Session(test_engine)
     
-    # Add some anomalies
-    for i in range(90, 100):
-        test_data[i]['consumption_mwh'] += 50  # Add spike
+    # Fixed noise so results are reproducible
+    np.random.seed(0)
     
-    # Insert test data
-    for data in test_data:
-        db.add(EnergyConsumption(**data))
+    # Add test data, kept as arrays until the records are built
+    i = np.arange(100)
+    daily_cycle = np.sin(i / 24 * 2 * np.pi)
+    timestamps = pd.date_range(datetime(2023, 1, 1), periods=100, freq='H').to_pydatetime()
+    consumption = np.maximum(10, 100 + 50 * daily_cycle + np.random.normal(0, 5, 100))  # Ensure positive consumption
+    temperature = 20 + 10 * daily_cycle + np.random.normal(0, 2, 100)
     
+    # Add some anomalies
+    consumption[90:100] += 50  # Add spike
+    
+    test_data = [
+        {
+            'timestamp': timestamp,
+            'region': 'test_region',
+            'consumption_mwh': value,
+            'temperature': temp
+        }
+        for timestamp, value, temp in zip(timestamps, consumption.tolist(), temperature.tolist())
+    ]
+    
+    # Insert test data in one executemany instead of a unit-of-work flush per object
+    db.bulk_insert_mappings(EnergyConsumption, test_data)
     db.commit()
     
     yield db
     
-    # Clean up
+    # Clean up; leave the tables for the other modules
+    db.rollback()
+    db.execute(text("DELETE FROM energy_consumption"))
+    db.execute(text("DELETE FROM anomalies"))
+    db.commit()
     db.close()
-    Base.metadata.drop_all(bind=engine)
 
-def test_anomaly_detection(test_db):
-    """Test anomaly detection functionality."""
+class _HourlyProfile:
+    """Stand-in for prophet.Prophet: predicts the training mean for each hour of day."""
+    
+    def __init__(self, series):
+        values = series.values().ravel()
+        hours = series.time_index.hour
+        self.profile = np.array([values[hours == h].mean() for h in range(24)])
+    
+    def predict(self, df):
+        return pd.DataFrame({'ds': df['ds'], 'yhat': self.profile[pd.DatetimeIndex(df['ds']).hour]})
+
+class _SeasonalNaive:
+    """Stand-in for darts' Prophet wrapper, with the same alignment."""
+    
+    def __init__(self, **model_params):
+        self.model = None
+        self.end = None
+    
+    def fit(self, series):
+        self.model = _HourlyProfile(series)
+        self.end = series.end_time()
+        return self
+    
+    def predict(self, n, *args, **kwargs):
+        # Like a darts forecaster, the forecast starts right after the training data
+        times = pd.date_range(self.end + timedelta(hours=1), periods=n, freq='H')
+        yhat = self.model.predict(pd.DataFrame({'ds': times}))['yhat'].to_numpy()
+        return TimeSeries.from_times_and_values(times, yhat)
+
+@pytest.fixture(scope="module")
+def anomaly_result(test_db):
+    """Run anomaly detection once, without fitting Prophet."""
     # Create ML service
     ml_service = MLService(test_db)
     
@@ -57,32 +93,41 @@ def test_anomaly_detection(test_db):
     end_date = datetime(2023, 1, 5)  # 5 days of hourly data
     start_date = end_date - timedelta(days=4)
     
-    # Test anomaly detection
-    result = ml_service.detect_anomalies(
-        start_date=start_date,
-        end_date=end_date,
-        region='test_region',
-        model_params={'interval_width': 0.95},
-        fit_params={'test_size': 0.2},
-        predict_params={'threshold_std': 2.0}
-    )
+    # The daily cycle is the whole signal, so a seasonal naive forecast is a
+    # cheap baseline with the same alignment as Prophet's
+    with patch('src.ml.anomaly_detection.Prophet', _SeasonalNaive):
+        return ml_service.detect_anomalies(
+            start_date=start_date,
+            end_date=end_date,
+            region='test_region',
+            model_params={'interval_width': 0.95},
+            fit_params={'test_size': 0.2},
+            predict_params={'threshold_std': 2.0}
+        )
+
+def test_anomaly_detection(anomaly_result):
+    """Test anomaly detection functionality."""
+    result = anomaly_result
     
     # Check if anomalies were detected
     assert 'anomalies' in result
     assert len(result['anomalies']) > 0
     assert any(a['is_anomaly'] for a in result['anomalies'])
-
-def test_forecasting(test_db):
-    """Test forecasting functionality."""
-    # Create ML service
-    ml_service = MLService(test_db)
     
+    # Only the injected spikes (from 4 Jan 18:00) are flagged
+    flagged = [a['timestamp'] for a in result['anomalies'] if a['is_anomaly']]
+    assert min(flagged) >= datetime(2023, 1, 4, 18)
+    
+    # The forecast overlaps the held-out data, so every metric is defined
+    assert all(np.isfinite(value) for value in result['metrics'].values())
+
+def _forecast(ml_service):
+    """Forecast the next 24 hours from 4 days of test data."""
     # Test dates
     end_date = datetime(2023, 1, 5)  # 5 days of hourly data
     start_date = end_date - timedelta(days=4)
     
-    # Test forecasting
-    result = ml_service.forecast_consumption(
+    return ml_service.forecast_consumption(
         start_date=start_date,
         end_date=end_date,
         n_periods=24,  # Forecast next 24 hours
@@ -95,28 +140,46 @@ def test_forecasting(test_db):
         },
         fit_params={'test_size': 0.2}
     )
+
+def _flat_forecast(n, *args, **kwargs):
+    """Stand-in for Prophet.predict: n hourly points of a flat scaled series."""
+    times = pd.date_range(datetime(2023, 1, 5), periods=n, freq='H')
+    return TimeSeries.from_times_and_values(times, np.full(n, 0.5))
+
+@patch('src.ml.forecasting.Prophet')
+def test_forecasting(mock_prophet, test_db):
+    """Test forecasting functionality."""
+    # Prophet's Stan fit takes seconds; the service logic only needs its output
+    mock_prophet.return_value.predict.side_effect = _flat_forecast
+    
+    result = _forecast(MLService(test_db))
     
     # Check if forecast was generated
+    assert mock_prophet.return_value.fit.call_count == 1
     assert 'forecast' in result
     assert len(result['forecast']) == 24
     assert 'metrics' in result
     assert 'mae' in result['metrics']
 
-def test_anomaly_stats(test_db):
+@pytest.mark.slow
+def test_forecasting_prophet(test_db):
+    """Test forecasting with a real Prophet fit."""
+    result = _forecast(MLService(test_db))
+    
+    # Check if forecast was generated
+    assert 'forecast' in result
+    assert len(result['forecast']) == 24
+    assert 'metrics' in result
+    assert 'mae' in result['metrics']
+
+def test_anomaly_stats(test_db, anomaly_result):
     """Test anomaly statistics functionality."""
-    # Create ML service
+    # Create ML service; anomaly_result has saved the detected anomalies
     ml_service = MLService(test_db)
     
-    # First, detect some anomalies
     end_date = datetime(2023, 1, 5)
     start_date = end_date - timedelta(days=4)
     
-    ml_service.detect_anomalies(
-        start_date=start_date,
-        end_date=end_date,
-        region='test_region'
-    )
-    
     # Get anomaly stats
     stats = ml_service.get_anomaly_stats(
         start_date=start_date,